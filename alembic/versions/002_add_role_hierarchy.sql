@@ -0,0 +1,10 @@
+-- Saturn MouseHunter 认证服务 - 角色继承
+-- 角色继承父角色（及其祖先）的全部权限，不必在 mh_auth_role_permissions 中重复授权
+
+ALTER TABLE mh_auth_roles
+    ADD COLUMN parent_role_id VARCHAR(50) REFERENCES mh_auth_roles(id) ON DELETE SET NULL;
+
+ALTER TABLE mh_auth_roles
+    ADD CONSTRAINT mh_auth_roles_parent_not_self CHECK (parent_role_id <> id);
+
+CREATE INDEX idx_mh_auth_roles_parent_role_id ON mh_auth_roles(parent_role_id);
@@ -2,56 +2,63 @@
 认证服务 - FastAPI依赖项
 """
 from typing import Optional, List
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from application.utils import JWTUtils
-from infrastructure.config import get_jwt_config
+from application.utils import Principal, get_jwt_verifier, get_permission_registry, get_role_registry
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
 
 
+def _resolve_principal(request: Request, token: str) -> Optional[Principal]:
+    """解析令牌为 Principal，同一请求内只解析一次"""
+    cached = getattr(request.state, "principal", None)
+    if cached is not None:
+        return cached
+
+    user_info = get_jwt_verifier().extract_user_info(token)
+    if not user_info:
+        return None
+
+    principal = Principal(user_info)
+    request.state.principal = principal
+    return principal
+
+
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> dict:
+) -> Principal:
     """获取当前认证用户"""
-    jwt_config = get_jwt_config()
-    jwt_utils = JWTUtils(jwt_config)
-
-    token = credentials.credentials
-    user_info = jwt_utils.extract_user_info(token)
+    principal = _resolve_principal(request, credentials.credentials)
 
-    if not user_info:
+    if not principal:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="无效的访问令牌",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user_info
+    return principal
 
 
 async def get_current_user_optional(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
-) -> Optional[dict]:
+) -> Optional[Principal]:
     """获取当前认证用户（可选，不会抛出异常）"""
     if not credentials:
         return None
 
-    jwt_config = get_jwt_config()
-    jwt_utils = JWTUtils(jwt_config)
-
     try:
-        token = credentials.credentials
-        user_info = jwt_utils.extract_user_info(token)
-        return user_info
+        return _resolve_principal(request, credentials.credentials)
     except Exception:
         return None
 
 
-async def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
+async def get_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """获取管理员用户"""
-    if current_user.get("user_type") != "ADMIN":
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="需要管理员权限"
@@ -59,9 +66,9 @@ async def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict
     return current_user
 
 
-async def get_tenant_user(current_user: dict = Depends(get_current_user)) -> dict:
+async def get_tenant_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """获取租户用户"""
-    if current_user.get("user_type") != "TENANT":
+    if not current_user.is_tenant:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="需要租户用户权限"
@@ -70,12 +77,13 @@ async def get_tenant_user(current_user: dict = Depends(get_current_user)) -> dic
 
 
 def require_permissions(required_permissions: List[str]):
-    """要求特定权限"""
-    async def permission_checker(current_user: dict = Depends(get_current_user)):
-        user_permissions = set(current_user.get("permissions", []))
-        required_perms = set(required_permissions)
+    """要求特定权限（通配符要求须由用户持有的同一通配符或更短的通配符满足）"""
+    if not required_permissions:
+        raise ValueError("require_permissions 至少需要一个权限")
+    required_mask = get_permission_registry().mask(required_permissions)
 
-        if not required_perms.issubset(user_permissions):
+    async def permission_checker(current_user: Principal = Depends(get_current_user)):
+        if not current_user.has_all_permissions(required_mask):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="权限不足"
@@ -87,11 +95,10 @@ def require_permissions(required_permissions: List[str]):
 
 def require_roles(required_roles: List[str]):
     """要求特定角色"""
-    async def role_checker(current_user: dict = Depends(get_current_user)):
-        user_roles = set(current_user.get("roles", []))
-        required_role_set = set(required_roles)
+    required_mask = get_role_registry().mask(required_roles)
 
-        if not required_role_set.intersection(user_roles):
+    async def role_checker(current_user: Principal = Depends(get_current_user)):
+        if not current_user.has_any_role(required_mask):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="角色权限不足"
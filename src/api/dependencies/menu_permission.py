@@ -7,6 +7,7 @@ from functools import wraps
 from fastapi import HTTPException, status
 from saturn_mousehunter_shared.log.logger import get_logger
 from application.services.menu_permission_service import MenuPermissionService
+from application.utils import Principal, get_permission_registry
 from domain.models.auth_user_role import UserType
 
 log = get_logger(__name__)
@@ -19,6 +20,8 @@ def require_menu_permission(menu_permission: str):
     Args:
         menu_permission: 菜单权限编码，如 'menu:dashboard'
     """
+    required_mask = get_permission_registry().mask([menu_permission])
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -31,8 +34,8 @@ def require_menu_permission(menu_permission: str):
                 )
 
             # 检查菜单权限
-            user_permissions = current_user.get('permissions', [])
-            if menu_permission not in user_permissions:
+            principal = Principal.of(current_user)
+            if not principal.has_all_permissions(required_mask):
                 log.warning(
                     f"User {current_user.get('user_id')} denied access to menu "
                     f"requiring permission: {menu_permission}"
@@ -54,6 +57,9 @@ def require_menu_permissions(menu_permissions: List[str]):
     Args:
         menu_permissions: 菜单权限编码列表
     """
+    registry = get_permission_registry()
+    required_mask = registry.mask(menu_permissions)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -64,14 +70,11 @@ def require_menu_permissions(menu_permissions: List[str]):
                     detail="未认证用户"
                 )
 
-            user_permissions = set(current_user.get('permissions', []))
-            missing_permissions = []
-
-            for permission in menu_permissions:
-                if permission not in user_permissions:
-                    missing_permissions.append(permission)
+            principal = Principal.of(current_user)
 
-            if missing_permissions:
+            if not principal.has_all_permissions(required_mask):
+                # 仅在拒绝时还原缺失的权限用于提示
+                missing_permissions = registry.codes_of(required_mask & ~principal.masks()[0])
                 log.warning(
                     f"User {current_user.get('user_id')} missing menu permissions: "
                     f"{missing_permissions}"
@@ -93,6 +96,8 @@ def require_any_menu_permission(menu_permissions: List[str]):
     Args:
         menu_permissions: 菜单权限编码列表
     """
+    required_mask = get_permission_registry().mask(menu_permissions)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -103,12 +108,10 @@ def require_any_menu_permission(menu_permissions: List[str]):
                     detail="未认证用户"
                 )
 
-            user_permissions = set(current_user.get('permissions', []))
+            principal = Principal.of(current_user)
 
             # 检查是否有任意一个权限
-            has_permission = any(perm in user_permissions for perm in menu_permissions)
-
-            if not has_permission:
+            if not principal.has_any_permission(required_mask):
                 log.warning(
                     f"User {current_user.get('user_id')} missing any of menu permissions: "
                     f"{menu_permissions}"
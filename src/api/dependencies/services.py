@@ -5,11 +5,11 @@ from fastapi import Depends
 from application.services import AdminUserService, TenantUserService
 from application.services.role_service import RoleService
 from application.services.permission_service import PermissionService
-from application.services.menu_permission_service import MenuPermissionService
-from application.utils import JWTUtils
+from application.services.menu_permission_service import MenuPermissionService, get_menu_engine
+from application.services.authz_service import AuthzService
+from application.utils import JWTUtils, TokenIntrospector, get_jwt_verifier
 from infrastructure.repositories import AdminUserRepo, TenantUserRepo, UserRoleRepo, AuditLogRepo, RoleRepo, PermissionRepo
 from infrastructure.repositories.menu_repo import MenuRepo
-from infrastructure.config import get_jwt_config
 from api.dependencies.dao import get_dao
 
 
@@ -56,9 +56,15 @@ async def get_menu_repo() -> MenuRepo:
 
 
 async def get_jwt_utils() -> JWTUtils:
-    """获取JWT工具"""
-    jwt_config = get_jwt_config()
-    return JWTUtils(jwt_config)
+    """获取JWT工具（进程级共享实例）"""
+    return get_jwt_verifier()
+
+
+async def get_token_introspector(
+    jwt_utils: JWTUtils = Depends(get_jwt_utils),
+) -> TokenIntrospector:
+    """获取令牌自省引擎"""
+    return TokenIntrospector(jwt_utils)
 
 
 async def get_admin_user_service(
@@ -113,15 +119,13 @@ async def get_permission_service(
     )
 
 
-async def get_menu_permission_service(
+async def get_authz_service(
     user_role_repo: UserRoleRepo = Depends(get_user_role_repo),
-    menu_repo: MenuRepo = Depends(get_menu_repo),
-) -> MenuPermissionService:
-    """获取菜单权限服务"""
-    service = MenuPermissionService(
-        user_role_repo=user_role_repo,
-        menu_repo=menu_repo
-    )
-    # 初始化菜单存储
-    await service.initialize_menu_storage()
-    return service
\ No newline at end of file
+) -> AuthzService:
+    """获取授权判定服务"""
+    return AuthzService(user_role_repo=user_role_repo)
+
+
+async def get_menu_permission_service() -> MenuPermissionService:
+    """获取菜单权限服务（应用级单例，在 lifespan 中初始化）"""
+    return get_menu_engine()
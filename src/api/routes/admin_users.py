@@ -184,7 +184,7 @@ async def change_password(
 ):
     """修改密码"""
     # 只能修改自己的密码，或者有用户管理权限
-    if user_id != current_user["user_id"] and "user:write" not in current_user.get("permissions", []):
+    if user_id != current_user["user_id"] and not current_user.has_permission("user:write"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="只能修改自己的密码或需要用户管理权限"
@@ -1,18 +1,22 @@
 """
 认证服务 - 认证相关API路由
 """
-from datetime import datetime, timezone
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel, Field
 from saturn_mousehunter_shared.log.logger import get_logger
 from api.dependencies.auth import get_current_user_optional
-from api.dependencies.services import get_jwt_utils
-from application.utils import JWTUtils
+from api.dependencies.services import get_jwt_utils, get_token_introspector
+from application.utils import JWTUtils, TokenIntrospector
 
 log = get_logger(__name__)
 router = APIRouter(prefix="/auth", tags=["认证"])
 
+# 单次批量校验的令牌数上限
+MAX_BATCH_TOKENS = 500
+
 
 class TokenValidationRequest(BaseModel):
     """Token验证请求"""
@@ -30,6 +34,18 @@ class TokenStatusResponse(BaseModel):
     time_until_expiry: Optional[int] = None  # 剩余秒数
 
 
+class BatchTokenValidationRequest(BaseModel):
+    """批量Token验证请求"""
+    tokens: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_TOKENS, description="待验证的Token列表")
+
+
+class BatchTokenStatusResponse(BaseModel):
+    """批量Token状态响应（结果顺序与请求一致）"""
+    total: int
+    valid_count: int
+    results: List[TokenStatusResponse]
+
+
 class RefreshTokenRequest(BaseModel):
     """刷新Token请求"""
     refresh_token: str
@@ -38,7 +54,7 @@ class RefreshTokenRequest(BaseModel):
 @router.post("/validate-token", response_model=TokenStatusResponse)
 async def validate_token(
     request: TokenValidationRequest,
-    jwt_utils: JWTUtils = Depends(get_jwt_utils)
+    introspector: TokenIntrospector = Depends(get_token_introspector)
 ):
     """
     验证Token状态
@@ -47,27 +63,8 @@ async def validate_token(
     避免客户端在协程中进行复杂的Token检查而导致取消错误
     """
     try:
-        # 获取Token信息（不验证过期）
-        expiry = jwt_utils.get_token_expiry(request.token)
-        is_expired = jwt_utils.is_token_expired(request.token)
-
-        # 尝试提取用户信息
-        user_info = jwt_utils.extract_user_info(request.token) if not is_expired else None
-
-        # 计算剩余时间
-        time_until_expiry = None
-        if expiry and not is_expired:
-            time_until_expiry = int((expiry - datetime.now(timezone.utc)).total_seconds())
-
-        response = TokenStatusResponse(
-            valid=user_info is not None,
-            expired=is_expired,
-            expires_at=expiry,
-            issued_at=user_info.get("issued_at") if user_info else None,
-            user_id=user_info.get("user_id") if user_info else None,
-            user_type=user_info.get("user_type") if user_info else None,
-            time_until_expiry=time_until_expiry
-        )
+        # 只解码一次，从同一份载荷推导有效性、过期时间和剩余时间
+        response = TokenStatusResponse(**asdict(introspector.introspect(request.token)))
 
         log.debug(f"Token validation result: valid={response.valid}, expired={response.expired}")
         return response
@@ -85,6 +82,51 @@ async def validate_token(
         )
 
 
+@router.post("/validate-tokens", response_model=BatchTokenStatusResponse)
+async def validate_tokens(
+    request: BatchTokenValidationRequest,
+    introspector: TokenIntrospector = Depends(get_token_introspector)
+):
+    """
+    批量验证Token状态
+
+    供网关在扇出请求时一次性校验多个Token：所有Token共用同一份密钥和时间基准，
+    重复Token只解码一次，整个响应只序列化一次
+    """
+    statuses = introspector.introspect_many(request.tokens)
+    results = [TokenStatusResponse(**asdict(token_status)) for token_status in statuses]
+
+    response = BatchTokenStatusResponse(
+        total=len(results),
+        valid_count=sum(1 for result in results if result.valid),
+        results=results
+    )
+
+    log.debug(f"Batch token validation: total={response.total}, valid={response.valid_count}")
+    return Response(content=response.model_dump_json(), media_type="application/json")
+
+
+@router.get("/jwks")
+async def get_jwks(
+    request: Request,
+    jwt_utils: JWTUtils = Depends(get_jwt_utils)
+):
+    """
+    获取JSON Web Key Set
+
+    使用非对称算法（RS256/ES256/EdDSA等）时发布签名公钥，下游服务按令牌头中的 kid
+    选择公钥离线验签，不再需要调用 /auth/validate-token；对称算法下返回空集合
+    """
+    headers = {
+        "Cache-Control": f"public, max-age={jwt_utils.config.jwks_max_age_seconds}",
+        "ETag": jwt_utils.jwks_etag
+    }
+    if request.headers.get("if-none-match") == jwt_utils.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=jwt_utils.get_jwks(), media_type="application/json", headers=headers)
+
+
 @router.post("/refresh-token")
 async def refresh_token(
     request: RefreshTokenRequest,
@@ -0,0 +1,85 @@
+"""
+认证服务 - 授权判定API路由
+"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from api.dependencies.auth import get_current_user, get_admin_user
+from api.dependencies.services import get_authz_service
+from application.services.authz_service import AuthzService
+from application.utils import Principal
+from domain.models.auth_user_role import UserType
+
+router = APIRouter(prefix="/authz", tags=["授权判定"])
+
+# 单次调用的判定数上限
+MAX_BATCH_DECISIONS = 1000
+
+
+class AuthzSubject(BaseModel):
+    """判定主体"""
+    user_id: str = Field(..., description="用户ID")
+    user_type: UserType = Field(..., description="用户类型")
+
+
+class AuthzCheck(BaseModel):
+    """单个判定"""
+    subject: AuthzSubject
+    permission: str = Field(..., description="权限编码")
+
+
+class AuthzCheckRequest(BaseModel):
+    """批量授权判定请求"""
+    checks: List[AuthzCheck] = Field(..., min_length=1, max_length=MAX_BATCH_DECISIONS, description="判定列表")
+
+
+class AuthzDecision(BaseModel):
+    """判定结果"""
+    user_id: str
+    user_type: UserType
+    permission: str
+    allowed: bool
+
+
+class AuthzCheckResponse(BaseModel):
+    """批量授权判定响应（结果顺序与请求一致）"""
+    total: int
+    allowed_count: int
+    decisions: List[AuthzDecision]
+
+
+@router.post("/check", response_model=AuthzCheckResponse)
+async def check(
+    request: AuthzCheckRequest,
+    current_user: Principal = Depends(get_current_user),
+    authz_service: AuthzService = Depends(get_authz_service)
+):
+    """
+    批量授权判定
+
+    管理员可判定任意主体，其他用户只能判定自己。
+    """
+    checks = [((item.subject.user_id, item.subject.user_type), item.permission) for item in request.checks]
+    if not current_user.is_admin and any(
+        subject != (current_user.user_id, current_user.user_type) for subject, _ in checks
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="只能判定当前用户的权限"
+        )
+
+    results = await authz_service.check(checks)
+    decisions = [
+        AuthzDecision(user_id=user_id, user_type=user_type, permission=permission, allowed=allowed)
+        for ((user_id, user_type), permission), allowed in zip(checks, results)
+    ]
+    return AuthzCheckResponse(total=len(decisions), allowed_count=sum(results), decisions=decisions)
+
+
+@router.get("/stats", response_model=dict)
+async def stats(
+    current_user: Principal = Depends(get_admin_user),
+    authz_service: AuthzService = Depends(get_authz_service)
+):
+    """策略引擎统计（含判定延迟直方图，仅管理员）"""
+    return authz_service.engine.get_stats()
@@ -9,6 +9,7 @@ from saturn_mousehunter_shared.log.logger import get_logger
 from api.dependencies.auth import get_current_user
 from api.dependencies.services import get_menu_permission_service
 from application.services.menu_permission_service import MenuPermissionService
+from infrastructure.cache import publish_invalidation, MENUS_CHANGED
 from domain.models.auth_menu import (
     MenuTree, MenuType
 )
@@ -431,6 +432,33 @@ async def batch_import_menus(
         )
 
 
+@router.post("/reload", response_model=MenuResponse)
+async def reload_menus(
+    current_user: dict = Depends(get_current_user),
+    menu_service: MenuPermissionService = Depends(get_menu_permission_service)
+) -> MenuResponse:
+    """
+    重新加载内存中的菜单配置（所有 worker）
+
+    **权限要求**: 管理员权限
+    """
+    if current_user.get("user_type") != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="只有管理员可以重新加载菜单"
+        )
+
+    count = await menu_service.reload(strict=True)
+    await publish_invalidation(MENUS_CHANGED, menu_id=None)
+
+    log.info(f"Admin {current_user['user_id']} reloaded menus: {count}")
+    return MenuResponse(
+        success=True,
+        message=f"菜单已重新加载: {count} 个菜单",
+        data={"menu_count": count}
+    )
+
+
 @router.get("/{menu_id}", response_model=MenuTree)
 async def get_menu_by_id(
     menu_id: str,
@@ -2,13 +2,13 @@
 认证服务 - 菜单API路由
 """
 from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from saturn_mousehunter_shared.log.logger import get_logger
 from api.dependencies.auth import get_current_user
 from api.dependencies.services import get_menu_permission_service
 from api.dependencies.menu_permission import require_menu_permission
-from application.services.menu_permission_service import MenuPermissionService
+from application.services.menu_permission_service import MenuPermissionService, etag_matches
 from domain.models.auth_menu import (
     UserMenuResponse, MenuTree, MenuStatsResponse, MenuPermissionCheck
 )
@@ -19,8 +19,13 @@ log = get_logger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["菜单权限"])
 
 
+# 菜单因人而异，只允许浏览器私有缓存，且每次都要带 If-None-Match 重新验证
+MENU_CACHE_CONTROL = "private, no-cache"
+
+
 @router.get("/auth/user-menus", response_model=UserMenuResponse)
 async def get_user_menus(
+    request: Request,
     current_user: dict = Depends(get_current_user),
     menu_service: MenuPermissionService = Depends(get_menu_permission_service)
 ) -> UserMenuResponse:
@@ -35,17 +40,25 @@ async def get_user_menus(
     - permissions: 用户权限列表
     - menus: 可访问菜单树
     - updated_at: 更新时间
+
+    响应带 ETag（菜单版本 + 权限集合指纹），If-None-Match 命中时返回 304
     """
     try:
         user_id = current_user["user_id"]
         user_type = UserType(current_user["user_type"])
 
-        log.info(f"Getting menus for user: {user_id} ({user_type.value})")
-
-        result = await menu_service.get_user_accessible_menus(user_id, user_type)
+        log.debug(f"Getting menus for user: {user_id} ({user_type.value})")
 
-        log.info(f"User {user_id} has access to {len(result.menus)} menus")
-        return result
+        # 菜单树已预先序列化，直接返回字节，跳过响应模型的校验和编码
+        content, etag = await menu_service.render_user_menus_response(
+            user_id, user_type, request.headers.get("if-none-match")
+        )
+        headers = {"Cache-Control": MENU_CACHE_CONTROL}
+        if etag:
+            headers["ETag"] = etag
+        if content is None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=content, media_type="application/json", headers=headers)
 
     except Exception as e:
         log.error(f"Failed to get user menus: {str(e)}")
@@ -57,6 +70,8 @@ async def get_user_menus(
 
 @router.get("/menus/tree", response_model=List[MenuTree])
 async def get_menu_tree(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     menu_service: MenuPermissionService = Depends(get_menu_permission_service)
 ) -> List[MenuTree]:
@@ -68,6 +83,8 @@ async def get_menu_tree(
     **用途**:
     - 管理界面显示所有菜单
     - 权限配置界面
+
+    响应带 ETag（菜单版本），If-None-Match 命中时返回 304
     """
     try:
         # 只有管理员可以查看完整菜单树
@@ -77,7 +94,12 @@ async def get_menu_tree(
                 detail="只有管理员可以查看完整菜单树"
             )
 
+        headers = {"Cache-Control": MENU_CACHE_CONTROL, "ETag": menu_service.menu_tree_etag()}
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
         log.info(f"Getting full menu tree for admin: {current_user['user_id']}")
+        response.headers.update(headers)
         return menu_service.get_menu_tree()
 
     except HTTPException:
@@ -3,15 +3,37 @@
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import BaseModel, Field
 from domain.models.auth_permission import (
     PermissionIn, PermissionOut, PermissionUpdate, PermissionQuery
 )
+from domain.models.auth_user_role import UserPermissions, UserType
 from application.services.permission_service import PermissionService
+from infrastructure.repositories.user_role_repo import UserRoleRepo
 from api.dependencies.auth import get_admin_user
-from api.dependencies.services import get_permission_service
+from api.dependencies.services import get_permission_service, get_user_role_repo
 
 router = APIRouter(prefix="/admin/permissions", tags=["权限管理"])
 
+MAX_BATCH_USERS = 500
+
+
+class UserRef(BaseModel):
+    """用户标识"""
+    user_id: str = Field(..., description="用户ID")
+    user_type: UserType = Field(..., description="用户类型")
+
+
+class BatchUserPermissionsRequest(BaseModel):
+    """批量获取用户权限请求"""
+    users: List[UserRef] = Field(..., min_length=1, max_length=MAX_BATCH_USERS, description="用户列表")
+
+
+class BatchUserPermissionsResponse(BaseModel):
+    """批量用户权限响应（结果顺序与请求一致）"""
+    total: int
+    results: List[UserPermissions]
+
 
 @router.post("/", response_model=PermissionOut)
 async def create_permission(
@@ -74,6 +96,23 @@ async def check_permission_exists(
     return {"exists": exists, "permission_code": permission_code}
 
 
+@router.post("/users/batch", response_model=BatchUserPermissionsResponse)
+async def get_users_permissions(
+    request: BatchUserPermissionsRequest,
+    current_user: dict = Depends(get_admin_user),
+    user_role_repo: UserRoleRepo = Depends(get_user_role_repo)
+):
+    """
+    批量获取用户有效权限
+
+    缓存未命中的用户合并为一次数据库查询，替代逐个用户请求。
+    """
+    keys = [(user.user_id, user.user_type) for user in request.users]
+    resolved = await user_role_repo.get_users_permissions(keys)
+    results = [resolved[key] for key in keys]
+    return BatchUserPermissionsResponse(total=len(results), results=results)
+
+
 @router.get("/", response_model=List[PermissionOut])
 async def list_permissions(
     query_params: PermissionQuery = Depends(),
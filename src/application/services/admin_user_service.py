@@ -12,7 +12,9 @@ from domain.models.auth_admin_user import (
 )
 from domain.models.auth_user_role import UserType
 from domain.models.auth_audit_log import AuditLogIn
-from application.utils import PasswordUtils, JWTUtils
+from application.utils import (
+    PasswordUtils, JWTUtils, AsyncPasswordHasher, PasswordHasherBusyError, get_password_hasher
+)
 
 log = get_logger(__name__)
 
@@ -24,11 +26,13 @@ class AdminUserService:
                  admin_user_repo: AdminUserRepo,
                  user_role_repo: UserRoleRepo,
                  audit_log_repo: AuditLogRepo,
-                 jwt_utils: JWTUtils):
+                 jwt_utils: JWTUtils,
+                 password_hasher: Optional[AsyncPasswordHasher] = None):
         self.admin_user_repo = admin_user_repo
         self.user_role_repo = user_role_repo
         self.audit_log_repo = audit_log_repo
         self.jwt_utils = jwt_utils
+        self.password_hasher = password_hasher or get_password_hasher()
 
     @measure("service_admin_user_create_seconds")
     async def create_admin_user(self, user_data: AdminUserIn, created_by: str = None) -> AdminUserOut:
@@ -50,7 +54,7 @@ class AdminUserService:
                 raise ValueError(f"密码强度不足: {'; '.join(errors)}")
 
             # 哈希密码
-            user_data.password_hash = PasswordUtils.hash_password(user_data.password)
+            user_data.password_hash = await self.password_hasher.hash_password(user_data.password)
 
         # 创建用户
         admin_user = await self.admin_user_repo.create(user_data)
@@ -85,7 +89,7 @@ class AdminUserService:
             admin_user = await self.admin_user_repo.get_by_email_for_auth(login_data.username)
 
         # 验证用户存在且密码正确
-        if not admin_user or not PasswordUtils.verify_password(
+        if not admin_user or not await self.password_hasher.verify_password(
             login_data.password, admin_user.password_hash
         ):
             # 记录失败的登录尝试
@@ -192,7 +196,7 @@ class AdminUserService:
                 is_strong, errors = PasswordUtils.validate_password_strength(update_data.password)
                 if not is_strong:
                     raise ValueError(f"密码强度不足: {'; '.join(errors)}")
-                update_data.password_hash = PasswordUtils.hash_password(update_data.password)
+                update_data.password_hash = await self.password_hasher.hash_password(update_data.password)
                 # 清除原始密码字段，避免传递到数据库
                 update_data.password = None
 
@@ -222,7 +226,7 @@ class AdminUserService:
 
         except Exception as e:
             log.error(f"Failed to update admin user {user_id}: {str(e)}")
-            if isinstance(e, ValueError):
+            if isinstance(e, (ValueError, PasswordHasherBusyError)):
                 raise
             raise ValueError(f"更新用户失败: {str(e)}")
 
@@ -271,7 +275,7 @@ class AdminUserService:
             raise ValueError("用户不存在")
 
         # 验证旧密码
-        if not PasswordUtils.verify_password(old_password, admin_user.password_hash):
+        if not await self.password_hasher.verify_password(old_password, admin_user.password_hash):
             raise ValueError("当前密码不正确")
 
         # 验证新密码强度
@@ -280,7 +284,7 @@ class AdminUserService:
             raise ValueError(f"新密码强度不足: {'; '.join(errors)}")
 
         # 更新密码
-        password_hash = PasswordUtils.hash_password(new_password)
+        password_hash = await self.password_hasher.hash_password(new_password)
         update_data = AdminUserUpdate(password_hash=password_hash)
         updated_user = await self.admin_user_repo.update(admin_user.id, update_data)
 
@@ -337,7 +341,7 @@ class AdminUserService:
             raise ValueError(f"新密码强度不足: {'; '.join(errors)}")
 
         # 更新密码
-        password_hash = PasswordUtils.hash_password(new_password)
+        password_hash = await self.password_hasher.hash_password(new_password)
         update_data = AdminUserUpdate(password_hash=password_hash)
         updated_user = await self.admin_user_repo.update(user_id, update_data)
 
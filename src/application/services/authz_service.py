@@ -0,0 +1,148 @@
+"""
+认证服务 - 授权判定Service
+
+把授权判定所需的数据编译为位掩码：MENU_PERMISSIONS 按用户类型编译一次，
+用户的角色/角色权限由权限缓存和角色权限投影解析后编译为主体掩码，
+每个 (主体, 权限) 判定只需一次字典查找和一次按位与。
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from domain.models.auth_menu import MENU_PERMISSIONS
+from domain.models.auth_user_role import UserPermissions, UserType
+from application.utils.permission_registry import PermissionRegistry, get_permission_registry, is_wildcard
+from infrastructure.repositories.user_role_repo import UserRoleRepo
+
+# 判定延迟直方图的桶上界（微秒）
+LATENCY_BUCKETS_US: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class LatencyHistogram:
+    """固定桶延迟直方图"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_US):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # 最后一个桶为 +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def observe_many(self, values: Iterable[float]) -> None:
+        with self._lock:
+            for value in values:
+                self._counts[bisect_left(self.buckets, value)] += 1
+                self._sum += value
+                self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """累计桶计数（le 语义，与 Prometheus 直方图一致）"""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {
+            "count": count,
+            "sum": round(total, 3),
+            "avg": round(total / count, 3) if count else 0.0,
+            "buckets": cumulative,
+        }
+
+
+class PolicyEngine:
+    """编译后的授权策略"""
+
+    def __init__(self,
+                 type_permissions: Mapping[str, Iterable[str]] = MENU_PERMISSIONS,
+                 registry: Optional[PermissionRegistry] = None):
+        self.registry = registry if registry is not None else get_permission_registry()
+        # 用户类型 -> 按类型授予的权限掩码
+        self._type_masks: Dict[str, int] = {}
+        for code, user_types in type_permissions.items():
+            bit = 1 << self.registry.intern(code)
+            for user_type in user_types:
+                self._type_masks[user_type] = self._type_masks.get(user_type, 0) | bit
+        self.decision_latency = LatencyHistogram()  # 单个判定，微秒
+        self.resolve_latency = LatencyHistogram()   # 每次调用解析主体（可能访问数据库），微秒
+        self._allowed = 0
+        self._denied = 0
+
+    def compile_subject(self, user_permissions: UserPermissions) -> Tuple[int, Tuple[str, ...]]:
+        """主体 -> (有效权限掩码, 通配符前缀)，掩码为角色权限 ∪ 用户类型权限"""
+        # 角色权限来自数据库，集合有限，登记后才能与请求的权限比较；通配符经前缀树展开
+        mask = self.registry.grant_mask(user_permissions.permissions)
+        prefixes = tuple(code[:-1] for code in user_permissions.permissions if is_wildcard(code))
+        return mask | self._type_masks.get(user_permissions.user_type.value, 0), prefixes
+
+    def evaluate(self,
+                 subjects: Mapping[Tuple[str, UserType], Tuple[int, Tuple[str, ...]]],
+                 checks: Iterable[Tuple[Tuple[str, UserType], str]]) -> List[bool]:
+        """批量判定，结果顺序与输入一致"""
+        position_of = self.registry.position
+        results = []
+        timings = []
+        clock = time.perf_counter
+        for subject, permission in checks:
+            started = clock()
+            mask, prefixes = subjects.get(subject, (0, ()))
+            position = position_of(permission)
+            if position is not None:
+                allowed = bool(mask >> position & 1)
+            else:
+                # 未登记的编码不登记（避免客户端输入撑大注册表），只可能被通配符命中
+                allowed = bool(prefixes) and permission.startswith(prefixes)
+            timings.append((clock() - started) * 1e6)
+            results.append(allowed)
+
+        self.decision_latency.observe_many(timings)
+        allowed_count = sum(results)
+        self._allowed += allowed_count
+        self._denied += len(results) - allowed_count
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "allowed": self._allowed,
+            "denied": self._denied,
+            "type_grants": {user_type: bin(mask).count("1") for user_type, mask in self._type_masks.items()},
+            "decision_latency_us": self.decision_latency.snapshot(),
+            "resolve_latency_us": self.resolve_latency.snapshot(),
+        }
+
+
+_policy_engine: Optional[PolicyEngine] = None
+
+
+def get_policy_engine() -> PolicyEngine:
+    """获取进程级共享的策略引擎"""
+    global _policy_engine
+    if _policy_engine is None:
+        _policy_engine = PolicyEngine()
+    return _policy_engine
+
+
+class AuthzService:
+    """授权判定服务"""
+
+    def __init__(self, user_role_repo: UserRoleRepo, engine: Optional[PolicyEngine] = None):
+        self.user_role_repo = user_role_repo
+        self.engine = engine if engine is not None else get_policy_engine()
+
+    async def check(self, checks: List[Tuple[Tuple[str, UserType], str]]) -> List[bool]:
+        """批量判定 (主体, 权限)，主体一次性批量解析"""
+        started = time.perf_counter()
+        subjects = await self.user_role_repo.get_users_permissions(subject for subject, _ in checks)
+        compiled = {key: self.engine.compile_subject(value) for key, value in subjects.items()}
+        self.engine.resolve_latency.observe((time.perf_counter() - started) * 1e6)
+        return self.engine.evaluate(compiled, checks)
@@ -1,34 +1,184 @@
 """
 认证服务 - 菜单权限服务
 """
-from typing import List, Dict, Optional, Set, Any
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Set, Any, Iterable, Tuple
 from datetime import datetime
 
+from pydantic import TypeAdapter
+
 from saturn_mousehunter_shared.aop.decorators import measure
 from saturn_mousehunter_shared.log.logger import get_logger
 from infrastructure.repositories import UserRoleRepo
+from infrastructure.cache.menu_tree_cache import MenuTreeCache, get_menu_tree_cache
 from infrastructure.repositories.menu_repo import MenuRepo
 from domain.models.auth_menu import (
     MenuConfig, MenuTree, UserMenuResponse, MenuStatsResponse,
     MenuPermissionCheck, DEFAULT_MENU_CONFIG, SATURN_MHC_MENU_CONFIG, MENU_PERMISSIONS, MenuType
 )
 from domain.models.auth_user_role import UserType
+from application.utils.permission_registry import PermissionRegistry, PermissionSet, get_permission_registry
 
 log = get_logger(__name__)
 
+_MENU_TREE_LIST = TypeAdapter(List[MenuTree])
+_STR_LIST = TypeAdapter(List[str])
+
+
+def permission_fingerprint(permissions: Iterable[str]) -> str:
+    """权限集合的稳定指纹：与顺序和重复无关"""
+    digest = hashlib.blake2b("\n".join(sorted(set(permissions))).encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 弱比较，支持 * 和逗号分隔的多个值"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class RenderedMenus:
+    """过滤并预先序列化的菜单树，同一权限集合的用户共享"""
+    version: int        # 构建时的菜单版本（本进程内判断缓存是否过期）
+    config_digest: str  # 构建时的菜单配置摘要（用于 ETag，各 worker 一致）
+    fingerprint: str
+    permissions: Tuple[str, ...]
+    menus: List[MenuTree]
+    permissions_json: bytes
+    menus_json: bytes
+
+    def render_response(self, user_id: str, user_type: str) -> bytes:
+        """拼接 UserMenuResponse 的 JSON，菜单部分直接复用已序列化的字节"""
+        return b"".join((
+            b'{"user_id":', json.dumps(user_id).encode(),
+            b',"user_type":', json.dumps(user_type).encode(),
+            b',"permissions":', self.permissions_json,
+            b',"menus":', self.menus_json,
+            b',"updated_at":"', datetime.now().isoformat().encode(), b'"}',
+        ))
+
+    @property
+    def size(self) -> int:
+        """估算的内存占用（序列化字节数）"""
+        return len(self.permissions_json) + len(self.menus_json)
+
+
+_EMPTY_MENUS = RenderedMenus(version=-1, config_digest="", fingerprint=permission_fingerprint(()), permissions=(), menus=[], permissions_json=b"[]", menus_json=b"[]")
+
+
+def _sort_key(menu: MenuConfig) -> int:
+    return menu.sort_order
+
+
+class MenuIndex:
+    """
+    编译后的菜单索引
+
+    菜单树在编译时按 sort_order 排好序并展平为先序数组，记录每个节点的父节点下标和所需权限的位序号。
+    过滤只需逆序扫描一遍判定可见性（子菜单可见则父菜单可见），再顺序扫描一遍挂接子节点，
+    不递归、不排序，也不再逐字段校验构造 MenuTree。
+    """
+
+    def __init__(self, menus: List[MenuConfig], registry: Optional[PermissionRegistry] = None):
+        self.source = menus
+        self.registry = registry if registry is not None else get_permission_registry()
+        self._fields: List[Dict[str, Any]] = []
+        self._parents: List[int] = []    # -1 表示顶级菜单
+        self._positions: List[int] = []  # -1 表示无需权限
+
+        stack = [(menu, -1) for menu in reversed(sorted(menus, key=_sort_key))]
+        while stack:
+            menu, parent = stack.pop()
+            index = len(self._fields)
+            self._fields.append({
+                "id": menu.id,
+                "name": menu.name,
+                "title": menu.title,
+                "title_en": getattr(menu, 'title_en', None),
+                "path": menu.path,
+                "icon": menu.icon,
+                "emoji": getattr(menu, 'emoji', None),
+                "permission": menu.permission,
+                "menu_type": menu.menu_type,
+                "sort_order": menu.sort_order,
+                "is_hidden": menu.is_hidden,
+                "status": getattr(menu, 'status', 'active'),
+                "meta": menu.meta,
+            })
+            self._parents.append(parent)
+            self._positions.append(self.registry.intern(menu.permission) if menu.permission else -1)
+            if menu.children:
+                stack.extend((child, index) for child in reversed(sorted(menu.children, key=_sort_key)))
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def filter(self, user_permissions: PermissionSet) -> List[MenuTree]:
+        """按权限过滤：有权限、无需权限或有可见子菜单的节点可见"""
+        mask = user_permissions.mask
+        parents = self._parents
+        positions = self._positions
+        visible = [False] * len(parents)
+        for i in range(len(parents) - 1, -1, -1):
+            position = positions[i]
+            if visible[i] or position < 0 or mask >> position & 1:
+                visible[i] = True
+                if parents[i] >= 0:
+                    visible[parents[i]] = True
+        return self._build(visible)
+
+    def tree(self) -> List[MenuTree]:
+        """完整菜单树（不过滤权限）"""
+        return self._build([True] * len(self._parents))
+
+    def _build(self, visible: List[bool]) -> List[MenuTree]:
+        roots: List[MenuTree] = []
+        nodes: List[Optional[MenuTree]] = [None] * len(visible)
+        fields = self._fields
+        parents = self._parents
+        for i, is_visible in enumerate(visible):
+            if is_visible:
+                # 字段在编译时已经过 MenuConfig 校验，直接构造
+                node = nodes[i] = MenuTree.model_construct(children=[], **fields[i])
+                parent = parents[i]
+                (roots if parent < 0 else nodes[parent].children).append(node)
+        return roots
+
 
 class MenuPermissionService:
     """菜单权限服务"""
 
-    def __init__(self, user_role_repo: UserRoleRepo, menu_repo: Optional[MenuRepo] = None, use_saturn_mhc_menus: bool = True):
+    def __init__(self, user_role_repo: UserRoleRepo, menu_repo: Optional[MenuRepo] = None, use_saturn_mhc_menus: bool = True,
+                 menu_cache: Optional[MenuTreeCache] = None):
         self.user_role_repo = user_role_repo
         self.menu_repo = menu_repo
+        self.menu_cache = menu_cache if menu_cache is not None else get_menu_tree_cache()
 
         # 支持切换菜单配置：默认使用Saturn MHC完整菜单，可回退到原有菜单
         menu_config = SATURN_MHC_MENU_CONFIG if use_saturn_mhc_menus else DEFAULT_MENU_CONFIG
         self._menu_config = self._build_menu_dict(menu_config)
+        # 静态配置中的嵌套关系，数据库菜单替换静态菜单后（children 为空）仍按它挂接子菜单
+        self._static_parents = {
+            child.id: menu.id for menu in self._menu_config.values() for child in menu.children or ()
+        }
+        self._menu_index = self._compile_menu_index()
         self._menu_permissions = MENU_PERMISSIONS
         self._use_saturn_mhc = use_saturn_mhc_menus
+        # 菜单配置版本号，任何菜单变更都会递增；按用户类型缓存的菜单树只在版本不变时有效。
+        # 版本号只在本进程内有意义，ETag 改用菜单配置内容的摘要，各 worker、重启前后都一致
+        self._menu_version = 0
+        self._menu_digest = self._compute_menu_digest()
+        self._type_menus: Dict[str, RenderedMenus] = {}
+        self._type_permissions: Dict[str, Tuple[Set[str], str]] = {}
 
         log.info(f"MenuPermissionService initialized with {'Saturn MHC' if use_saturn_mhc_menus else 'Default'} menu config")
         log.info(f"Total menus loaded: {len(self._menu_config)}")
@@ -45,6 +195,101 @@ class MenuPermissionService:
                 log.error(f"Failed to initialize menu storage: {e}")
                 raise
 
+    @property
+    def menu_version(self) -> int:
+        return self._menu_version
+
+    def _compute_menu_digest(self) -> str:
+        """菜单配置内容摘要：按菜单ID排序后序列化，与加载顺序和进程无关"""
+        digest = hashlib.blake2b(digest_size=12)
+        menu_config = self._menu_config
+        for menu_id in sorted(menu_config):
+            digest.update(menu_config[menu_id].model_dump_json().encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def menu_tree_etag(self) -> str:
+        """完整菜单树的 ETag"""
+        return f'"{self._menu_digest}"'
+
+    def user_menus_etag(self, config_digest: str, fingerprint: str, user_id: str, user_type: UserType) -> str:
+        """用户菜单的 ETag：菜单配置摘要 + 权限集合指纹，响应体含用户ID，因此同时区分用户"""
+        digest = hashlib.blake2b(f"{fingerprint}:{user_type.value}:{user_id}".encode(), digest_size=12)
+        # 响应体中的 updated_at 每次不同，使用弱 ETag
+        return f'W/"{config_digest}.{digest.hexdigest()}"'
+
+    def _compile_menu_index(self) -> MenuIndex:
+        """由扁平的菜单字典重建菜单树并编译索引：按 parent_id 挂接，父菜单不在配置中的作为顶级菜单"""
+        menu_config = self._menu_config
+        children: Dict[str, List[str]] = {}
+        roots: List[str] = []
+        for menu_id, menu in menu_config.items():
+            parent_id = menu.parent_id or self._static_parents.get(menu_id)
+            if parent_id in menu_config and parent_id != menu_id:
+                children.setdefault(parent_id, []).append(menu_id)
+            else:
+                roots.append(menu_id)
+
+        def build(menu_id: str, path: Set[str]) -> MenuConfig:
+            # path 防止数据库中的 parent_id 成环
+            path = path | {menu_id}
+            nested = [build(child_id, path) for child_id in children.get(menu_id, ()) if child_id not in path]
+            return menu_config[menu_id].model_copy(update={"children": nested or None})
+
+        return MenuIndex([build(menu_id, set()) for menu_id in roots])
+
+    def _menus_changed(self) -> None:
+        """菜单配置变化：递增版本、重新编译索引、重新计算摘要并丢弃已渲染的菜单树"""
+        self._menu_version += 1
+        self._menu_index = self._compile_menu_index()
+        self._menu_digest = self._compute_menu_digest()
+        self._type_menus = {}
+        self.menu_cache.clear()
+
+    async def reload(self, strict: bool = False) -> int:
+        """
+        重建内存中的菜单配置：静态菜单配置叠加数据库中启用的菜单
+
+        所有整体重建（启动、跨 worker 事件、批量导入、管理接口）都走这里，各 worker 得到同一份菜单。
+        strict 为 True 时数据库读取失败直接抛出，否则只使用静态配置。
+        """
+        menu_config = SATURN_MHC_MENU_CONFIG if self._use_saturn_mhc else DEFAULT_MENU_CONFIG
+        for attempt in range(3):
+            version = self._menu_version
+            menus = self._build_menu_dict(menu_config)
+            if self.menu_repo:
+                try:
+                    for menu in await self.menu_repo.get_all_menus(status="active"):
+                        menus[menu.id] = menu
+                except Exception as e:
+                    if strict:
+                        log.error(f"Failed to reload menus from database: {e}")
+                        raise
+                    log.warning(f"Failed to load menus from database, using static config only: {e}")
+            # 加载期间收到菜单变更时重新加载，避免旧快照覆盖该变更
+            if version == self._menu_version:
+                break
+
+        # 整体替换，进行中的请求看到的始终是完整的一份配置
+        self._menu_config = menus
+        self._menus_changed()
+        log.info(f"Menu engine reloaded: {len(menus)} menus")
+        return len(menus)
+
+    async def handle_menus_changed(self, event: Dict[str, Any]) -> None:
+        """其他 worker 修改菜单后同步本进程的内存配置"""
+        menu_id = event.get("menu_id")
+        if menu_id is None or not self.menu_repo:
+            await self.reload()
+            return
+
+        menu = await self.menu_repo.get_menu_by_id(menu_id)
+        if menu is None or menu.status != "active":
+            self._menu_config.pop(menu_id, None)
+        else:
+            self._menu_config[menu_id] = menu
+        self._menus_changed()
+
     def _build_menu_dict(self, menus: List[MenuConfig]) -> Dict[str, MenuConfig]:
         """构建菜单字典"""
         menu_dict = {}
@@ -60,54 +305,96 @@ class MenuPermissionService:
 
         return menu_dict
 
-    @measure("service_menu_filter_seconds")
-    async def filter_menus_by_permissions(
+    def filter_menus_by_permissions(
         self,
         menus: List[MenuConfig],
-        user_permissions: Set[str]
+        user_permissions: Iterable[str]
     ) -> List[MenuTree]:
-        """根据用户权限过滤菜单"""
-        filtered_menus = []
+        """根据用户权限过滤菜单（传入 PermissionSet 时支持通配符授权）"""
+        if not isinstance(user_permissions, PermissionSet):
+            user_permissions = PermissionSet(user_permissions)
+        index = self._menu_index if menus is self._menu_index.source else MenuIndex(menus)
+        return index.filter(user_permissions)
 
-        for menu in menus:
-            # 创建菜单树节点
-            menu_tree = MenuTree(
-                id=menu.id,
-                name=menu.name,
-                title=menu.title,
-                title_en=getattr(menu, 'title_en', None),
-                path=menu.path,
-                icon=menu.icon,
-                emoji=getattr(menu, 'emoji', None),
-                permission=menu.permission,
-                menu_type=menu.menu_type,
-                sort_order=menu.sort_order,
-                is_hidden=menu.is_hidden,
-                status=getattr(menu, 'status', 'active'),
-                meta=menu.meta,
-                children=[]
-            )
+    @measure("service_menu_filter_seconds")
+    async def render_menus(self, user_permissions: Iterable[str]) -> RenderedMenus:
+        """按权限过滤菜单树并序列化"""
+        permissions = tuple(sorted(set(user_permissions)))
+        menus = self._menu_index.filter(PermissionSet(permissions))
+        return RenderedMenus(
+            version=self._menu_version,
+            config_digest=self._menu_digest,
+            fingerprint=permission_fingerprint(permissions),
+            permissions=permissions,
+            menus=menus,
+            permissions_json=_STR_LIST.dump_json(list(permissions)),
+            menus_json=_MENU_TREE_LIST.dump_json(menus),
+        )
 
-            # 处理子菜单
-            if menu.children:
-                filtered_children = await self.filter_menus_by_permissions(
-                    menu.children,
-                    user_permissions
-                )
-                menu_tree.children = filtered_children
+    async def _get_menu_permissions(self, user_id: str, user_type: UserType) -> Tuple[Iterable[str], str]:
+        """获取决定用户菜单的权限集合及其指纹"""
+        if self._use_saturn_mhc:
+            # 权限只由用户类型决定（静态配置），按类型记住权限和指纹
+            entry = self._type_permissions.get(user_type.value)
+            if entry is None:
+                permissions = self._get_user_permissions_by_type(user_type)
+                entry = self._type_permissions[user_type.value] = (permissions, permission_fingerprint(permissions))
+            return entry
+
+        # 使用原有的数据库权限查询
+        user_perms = await self.user_role_repo.get_user_permissions(user_id, user_type)
+        return user_perms.permissions, permission_fingerprint(user_perms.permissions)
+
+    async def _get_rendered_menus(self, user_type: UserType, permissions: Iterable[str], fingerprint: str) -> RenderedMenus:
+        if self._use_saturn_mhc:
+            # 每种用户类型只构建一次
+            rendered = self._type_menus.get(user_type.value)
+            if rendered is None:
+                rendered = await self.render_menus(permissions)
+                if rendered.version == self._menu_version:
+                    self._type_menus[user_type.value] = rendered
+                log.info(f"Rendered menus for user type {user_type.value}: {len(rendered.menus)} top-level menus")
+            return rendered
+
+        # 权限集合相同的用户共享同一棵菜单树
+        rendered = self.menu_cache.get(fingerprint)
+        if rendered is None:
+            rendered = await self.render_menus(permissions)
+            if rendered.version == self._menu_version:
+                self.menu_cache.put(fingerprint, rendered, rendered.size)
+        return rendered
+
+    @measure("service_get_rendered_user_menus_seconds")
+    async def get_rendered_user_menus(self, user_id: str, user_type: UserType) -> RenderedMenus:
+        """获取用户可访问的菜单树（已序列化）"""
+        permissions, fingerprint = await self._get_menu_permissions(user_id, user_type)
+        return await self._get_rendered_menus(user_type, permissions, fingerprint)
+
+    async def render_user_menus_response(
+        self,
+        user_id: str,
+        user_type: UserType,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        获取用户菜单并直接渲染为 UserMenuResponse JSON，返回 (响应体, ETag)
 
-                # 如果有子菜单权限，即使父菜单没有直接权限也要显示
-                # 或者父菜单有权限也要显示
-                if filtered_children or not menu.permission or menu.permission in user_permissions:
-                    filtered_menus.append(menu_tree)
-            else:
-                # 叶子菜单：检查权限
-                if not menu.permission or menu.permission in user_permissions:
-                    filtered_menus.append(menu_tree)
+        If-None-Match 命中当前版本时不构建菜单树，响应体为None；查询失败时返回空菜单且不带 ETag
+        """
+        try:
+            config_digest = self._menu_digest
+            permissions, fingerprint = await self._get_menu_permissions(user_id, user_type)
+            etag = self.user_menus_etag(config_digest, fingerprint, user_id, user_type)
+            if etag_matches(if_none_match, etag):
+                return None, etag
+            rendered = await self._get_rendered_menus(user_type, permissions, fingerprint)
+        except Exception as e:
+            log.error(f"Failed to get user menus for {user_id}: {str(e)}")
+            # 返回最基础的菜单
+            return _EMPTY_MENUS.render_response(user_id, user_type.value), None
 
-        # 按排序顺序排序
-        filtered_menus.sort(key=lambda x: x.sort_order)
-        return filtered_menus
+        etag = self.user_menus_etag(rendered.config_digest, rendered.fingerprint, user_id, user_type)
+        return rendered.render_response(user_id, user_type.value), etag
 
     @measure("service_get_user_menus_seconds")
     async def get_user_accessible_menus(
@@ -117,31 +404,12 @@ class MenuPermissionService:
     ) -> UserMenuResponse:
         """获取用户可访问的菜单"""
         try:
-            # 获取用户权限
-            if self._use_saturn_mhc:
-                # 使用新的权限映射逻辑
-                user_permissions = self._get_user_permissions_by_type(user_type)
-                log.info(f"User {user_id} ({user_type.value}) permissions from mapping: {user_permissions}")
-            else:
-                # 使用原有的数据库权限查询
-                user_perms = await self.user_role_repo.get_user_permissions(user_id, user_type)
-                user_permissions = set(user_perms.permissions)
-                log.info(f"User {user_id} permissions from DB: {user_permissions}")
-
-            # 获取当前菜单配置
-            menu_config = SATURN_MHC_MENU_CONFIG if self._use_saturn_mhc else DEFAULT_MENU_CONFIG
-
-            # 过滤菜单
-            accessible_menus = await self.filter_menus_by_permissions(
-                menu_config,
-                user_permissions
-            )
-
+            rendered = await self.get_rendered_user_menus(user_id, user_type)
             return UserMenuResponse(
                 user_id=user_id,
                 user_type=user_type.value,
-                permissions=list(user_permissions),
-                menus=accessible_menus,
+                permissions=list(rendered.permissions),
+                menus=rendered.menus,
                 updated_at=datetime.now()
             )
 
@@ -201,7 +469,7 @@ class MenuPermissionService:
             else:
                 # 使用原有数据库权限查询
                 user_perms = await self.user_role_repo.get_user_permissions(user_id, user_type)
-                has_permission = menu.permission in user_perms.permissions
+                has_permission = menu.permission in PermissionSet(user_perms.permissions)
 
             return MenuPermissionCheck(
                 menu_id=menu_id,
@@ -230,7 +498,7 @@ class MenuPermissionService:
                 user_permissions = self._get_user_permissions_by_type(user_type)
             else:
                 user_perms = await self.user_role_repo.get_user_permissions(user_id, user_type)
-                user_permissions = set(user_perms.permissions)
+                user_permissions = PermissionSet(user_perms.permissions)
 
             # 计算总菜单数（包括子菜单）
             total_menus = len(self._menu_config)
@@ -282,31 +550,8 @@ class MenuPermissionService:
 
     def get_menu_tree(self) -> List[MenuTree]:
         """获取完整菜单树（不过滤权限）"""
-        def build_tree(menus: List[MenuConfig]) -> List[MenuTree]:
-            tree = []
-            for menu in menus:
-                menu_tree = MenuTree(
-                    id=menu.id,
-                    name=menu.name,
-                    title=menu.title,
-                    title_en=getattr(menu, 'title_en', None),
-                    path=menu.path,
-                    icon=menu.icon,
-                    emoji=getattr(menu, 'emoji', None),
-                    permission=menu.permission,
-                    menu_type=menu.menu_type,
-                    sort_order=menu.sort_order,
-                    is_hidden=menu.is_hidden,
-                    status=getattr(menu, 'status', 'active'),
-                    meta=menu.meta,
-                    children=build_tree(menu.children) if menu.children else []
-                )
-                tree.append(menu_tree)
-            return sorted(tree, key=lambda x: x.sort_order)
-
         # 使用当前配置的菜单
-        menu_config = SATURN_MHC_MENU_CONFIG if self._use_saturn_mhc else DEFAULT_MENU_CONFIG
-        return build_tree(menu_config)
+        return self._menu_index.tree()
 
     # ======================== 菜单数据库管理方法 ========================
 
@@ -353,6 +598,7 @@ class MenuPermissionService:
 
         # 更新内存缓存
         self._menu_config[menu_id] = menu_config
+        self._menus_changed()
 
         log.info(f"Menu created successfully: {menu_id} by {created_by}")
         return menu_id
@@ -386,6 +632,7 @@ class MenuPermissionService:
             updated_menu = await self.menu_repo.get_menu_by_id(menu_id)
             if updated_menu:
                 self._menu_config[menu_id] = updated_menu
+            self._menus_changed()
 
             log.info(f"Menu updated successfully: {menu_id} by {updated_by}")
 
@@ -409,6 +656,7 @@ class MenuPermissionService:
             # 从内存缓存中移除
             if menu_id in self._menu_config:
                 del self._menu_config[menu_id]
+            self._menus_changed()
 
             log.info(f"Menu deleted successfully: {menu_id} by {deleted_by}")
 
@@ -432,7 +680,6 @@ class MenuPermissionService:
             # 如果需要清除现有菜单
             if clear_existing:
                 cleared_count = await self.menu_repo.clear_all_menus(created_by)
-                self._menu_config.clear()
                 log.info(f"Cleared {cleared_count} existing menus")
 
             # 转换为MenuConfig列表
@@ -477,9 +724,9 @@ class MenuPermissionService:
                 created_count = await self.menu_repo.batch_create_menus(menu_configs, created_by)
                 result["created_count"] = created_count
 
-                # 更新内存缓存
-                for menu_config in menu_configs:
-                    self._menu_config[menu_config.id] = menu_config
+            # 与其他 worker 处理 MENUS_CHANGED 的方式一致，整体重建内存配置
+            if clear_existing or menu_configs:
+                await self.reload()
 
             log.info(f"Batch import completed: {result}")
             return result
@@ -496,23 +743,21 @@ class MenuPermissionService:
         return await self.menu_repo.get_menu_by_id(menu_id)
 
     async def reload_menus_from_database(self) -> int:
-        """从数据库重新加载所有菜单到内存"""
-        if not self.menu_repo:
-            return 0
+        """从数据库重新加载所有菜单到内存（reload 的别名，数据库读取失败时抛出）"""
+        return await self.reload(strict=True)
 
-        try:
-            db_menus = await self.menu_repo.get_all_menus(status="active")
 
-            # 清空当前缓存
-            self._menu_config.clear()
+_menu_engine: Optional[MenuPermissionService] = None
 
-            # 重新构建缓存
-            for menu in db_menus:
-                self._menu_config[menu.id] = menu
 
-            log.info(f"Reloaded {len(db_menus)} menus from database")
-            return len(db_menus)
+def get_menu_engine() -> MenuPermissionService:
+    """获取应用级共享的菜单权限服务"""
+    if _menu_engine is None:
+        raise RuntimeError("Menu engine not initialized. Call set_menu_engine() first.")
+    return _menu_engine
 
-        except Exception as e:
-            log.error(f"Failed to reload menus from database: {e}")
-            raise
\ No newline at end of file
+
+def set_menu_engine(engine: Optional[MenuPermissionService]) -> None:
+    """设置应用级共享的菜单权限服务（在 lifespan 中初始化一次）"""
+    global _menu_engine
+    _menu_engine = engine
@@ -6,6 +6,7 @@ from saturn_mousehunter_shared.log.logger import get_logger
 from domain.models.auth_permission import PermissionIn, PermissionOut, PermissionUpdate, PermissionQuery
 from infrastructure.repositories.permission_repo import PermissionRepo
 from infrastructure.repositories.audit_log_repo import AuditLogRepo
+from infrastructure.cache.permission_cache import PermissionCache, get_permission_cache
 
 log = get_logger(__name__)
 
@@ -13,9 +14,11 @@ log = get_logger(__name__)
 class PermissionService:
     """权限服务"""
 
-    def __init__(self, permission_repo: PermissionRepo, audit_repo: AuditLogRepo):
+    def __init__(self, permission_repo: PermissionRepo, audit_repo: AuditLogRepo,
+                 permission_cache: Optional[PermissionCache] = None):
         self.permission_repo = permission_repo
         self.audit_repo = audit_repo
+        self.permission_cache = permission_cache if permission_cache is not None else get_permission_cache()
 
     async def create_permission(self, permission_data: PermissionIn, created_by: str) -> PermissionOut:
         """创建权限"""
@@ -66,6 +69,8 @@ class PermissionService:
         permission = await self.permission_repo.update(permission_id, update_data)
 
         if permission:
+            self.permission_cache.invalidate_permissions([existing_permission.permission_code])
+
             # 记录审计日志
             from domain.models.auth_audit_log import AuditLogIn, UserType
             audit_log = AuditLogIn(
@@ -97,6 +102,8 @@ class PermissionService:
         success = await self.permission_repo.delete(permission_id)
 
         if success:
+            self.permission_cache.invalidate_permissions([permission.permission_code])
+
             # 记录审计日志
             from domain.models.auth_audit_log import AuditLogIn, UserType
             audit_log = AuditLogIn(
@@ -6,6 +6,7 @@ from saturn_mousehunter_shared.log.logger import get_logger
 from domain.models.auth_role import RoleIn, RoleOut, RoleUpdate, RoleQuery, RoleWithPermissions
 from infrastructure.repositories.role_repo import RoleRepo
 from infrastructure.repositories.audit_log_repo import AuditLogRepo
+from infrastructure.cache.permission_cache import PermissionCache, get_permission_cache
 
 log = get_logger(__name__)
 
@@ -13,9 +14,11 @@ log = get_logger(__name__)
 class RoleService:
     """角色服务"""
 
-    def __init__(self, role_repo: RoleRepo, audit_repo: AuditLogRepo):
+    def __init__(self, role_repo: RoleRepo, audit_repo: AuditLogRepo,
+                 permission_cache: Optional[PermissionCache] = None):
         self.role_repo = role_repo
         self.audit_repo = audit_repo
+        self.permission_cache = permission_cache if permission_cache is not None else get_permission_cache()
 
     async def create_role(self, role_data: RoleIn, created_by: str) -> RoleOut:
         """创建角色"""
@@ -24,6 +27,9 @@ class RoleService:
         if existing_role:
             raise ValueError(f"角色编码 {role_data.role_code} 已存在")
 
+        if role_data.parent_role_id and not await self.role_repo.get_by_id(role_data.parent_role_id):
+            raise ValueError("父角色不存在")
+
         # 创建角色
         role = await self.role_repo.create(role_data)
 
@@ -71,10 +77,33 @@ class RoleService:
             )
             update_data = filtered_update
 
-        # 更新角色
+        parent_changed = False
+        if 'parent_role_id' in update_data.dict(exclude_unset=True):
+            parent_role_id = update_data.parent_role_id or None
+            if parent_role_id is None:
+                # 显式传 null 或空字符串：解除继承
+                update_data.parent_role_id = None
+            else:
+                if not await self.role_repo.get_by_id(parent_role_id):
+                    raise ValueError("父角色不存在")
+                if await self.role_repo.is_ancestor_or_self(role_id, parent_role_id):
+                    raise ValueError("父角色不能是角色自身或其子角色")
+            parent_changed = parent_role_id != existing_role.parent_role_id
+
+        # 更新角色（Repository 同步更新投影，父角色变化时继承闭包随之重建）
         role = await self.role_repo.update(role_id, update_data)
 
         if role:
+            if role.is_active and not existing_role.is_active:
+                # 重新启用的角色不在任何用户的有效角色中，无法按编码定位
+                self.permission_cache.clear()
+            else:
+                # 角色编码、启用状态或父角色可能变化，失效有效角色中包含该角色的用户
+                # （子角色的有效角色也包含该角色，继承链上的用户一并失效）
+                self.permission_cache.invalidate_roles([existing_role.role_code])
+            if parent_changed:
+                log.info(f"Role {role_id} parent changed: {existing_role.parent_role_id} -> {role.parent_role_id}")
+
             # 记录审计日志
             from domain.models.auth_audit_log import AuditLogIn, UserType
             audit_log = AuditLogIn(
@@ -108,6 +137,8 @@ class RoleService:
         success = await self.role_repo.delete(role_id)
 
         if success:
+            self.permission_cache.invalidate_roles([role.role_code])
+
             # 记录审计日志
             from domain.models.auth_audit_log import AuditLogIn, UserType
             audit_log = AuditLogIn(
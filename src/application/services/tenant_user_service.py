@@ -12,7 +12,9 @@ from domain.models.auth_tenant_user import (
 )
 from domain.models.auth_user_role import UserType
 from domain.models.auth_audit_log import AuditLogIn
-from application.utils import PasswordUtils, JWTUtils
+from application.utils import (
+    PasswordUtils, JWTUtils, AsyncPasswordHasher, PasswordHasherBusyError, get_password_hasher
+)
 
 log = get_logger(__name__)
 
@@ -24,11 +26,13 @@ class TenantUserService:
                  tenant_user_repo: TenantUserRepo,
                  user_role_repo: UserRoleRepo,
                  audit_log_repo: AuditLogRepo,
-                 jwt_utils: JWTUtils):
+                 jwt_utils: JWTUtils,
+                 password_hasher: Optional[AsyncPasswordHasher] = None):
         self.tenant_user_repo = tenant_user_repo
         self.user_role_repo = user_role_repo
         self.audit_log_repo = audit_log_repo
         self.jwt_utils = jwt_utils
+        self.password_hasher = password_hasher or get_password_hasher()
 
     @measure("service_tenant_user_create_seconds")
     async def create_tenant_user(self, user_data: TenantUserIn, created_by: str = None) -> TenantUserOut:
@@ -54,7 +58,7 @@ class TenantUserService:
                 raise ValueError(f"密码强度不足: {'; '.join(errors)}")
 
             # 哈希密码
-            user_data.password_hash = PasswordUtils.hash_password(user_data.password)
+            user_data.password_hash = await self.password_hasher.hash_password(user_data.password)
 
         # 创建用户
         tenant_user = await self.tenant_user_repo.create(user_data)
@@ -97,7 +101,7 @@ class TenantUserService:
             )
 
         # 验证用户存在且密码正确
-        if not tenant_user or not PasswordUtils.verify_password(
+        if not tenant_user or not await self.password_hasher.verify_password(
             login_data.password, tenant_user.password_hash if hasattr(tenant_user, 'password_hash') else ""
         ):
             # 记录失败的登录尝试
@@ -193,7 +197,7 @@ class TenantUserService:
                 is_strong, errors = PasswordUtils.validate_password_strength(update_data.password)
                 if not is_strong:
                     raise ValueError(f"密码强度不足: {'; '.join(errors)}")
-                update_data.password_hash = PasswordUtils.hash_password(update_data.password)
+                update_data.password_hash = await self.password_hasher.hash_password(update_data.password)
                 # 清除原始密码字段，避免传递到数据库
                 update_data.password = None
 
@@ -223,7 +227,7 @@ class TenantUserService:
 
         except Exception as e:
             log.error(f"Failed to update tenant user {user_id}: {str(e)}")
-            if isinstance(e, ValueError):
+            if isinstance(e, (ValueError, PasswordHasherBusyError)):
                 raise
             raise ValueError(f"更新用户失败: {str(e)}")
 
@@ -280,7 +284,7 @@ class TenantUserService:
             raise ValueError("用户不存在")
 
         # 验证旧密码
-        if not PasswordUtils.verify_password(old_password, getattr(tenant_user, 'password_hash', '')):
+        if not await self.password_hasher.verify_password(old_password, getattr(tenant_user, 'password_hash', '')):
             raise ValueError("当前密码不正确")
 
         # 验证新密码强度
@@ -289,7 +293,7 @@ class TenantUserService:
             raise ValueError(f"新密码强度不足: {'; '.join(errors)}")
 
         # 更新密码
-        password_hash = PasswordUtils.hash_password(new_password)
+        password_hash = await self.password_hasher.hash_password(new_password)
         update_data = TenantUserUpdate(password_hash=password_hash)
         updated_user = await self.tenant_user_repo.update(user_id, update_data)
 
@@ -328,7 +332,7 @@ class TenantUserService:
             raise ValueError(f"新密码强度不足: {'; '.join(errors)}")
 
         # 更新密码
-        password_hash = PasswordUtils.hash_password(new_password)
+        password_hash = await self.password_hasher.hash_password(new_password)
         update_data = TenantUserUpdate(password_hash=password_hash)
         updated_user = await self.tenant_user_repo.update(user_id, update_data)
 
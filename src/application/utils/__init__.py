@@ -3,9 +3,40 @@
 """
 
 from .password_utils import PasswordUtils
-from .jwt_utils import JWTUtils
+from .jwt_utils import JWTUtils, get_jwt_verifier, set_jwt_verifier, rotate_jwt_verifier
+from .token_cache import TokenCache
+from .permission_codec import PermissionCodec, get_permission_codec
+from .permission_registry import (
+    PermissionRegistry, PermissionSet, get_permission_registry, get_role_registry, compute_user_masks, is_wildcard
+)
+from .principal import Principal
+from .token_introspector import TokenIntrospector, TokenStatus
+from .password_hasher import (
+    AsyncPasswordHasher, PasswordHasherBusyError,
+    get_password_hasher, set_password_hasher, shutdown_password_hasher
+)
 
 __all__ = [
     "PasswordUtils",
-    "JWTUtils"
+    "JWTUtils",
+    "get_jwt_verifier",
+    "set_jwt_verifier",
+    "rotate_jwt_verifier",
+    "TokenCache",
+    "PermissionCodec",
+    "get_permission_codec",
+    "PermissionRegistry",
+    "PermissionSet",
+    "is_wildcard",
+    "get_permission_registry",
+    "get_role_registry",
+    "compute_user_masks",
+    "Principal",
+    "TokenIntrospector",
+    "TokenStatus",
+    "AsyncPasswordHasher",
+    "PasswordHasherBusyError",
+    "get_password_hasher",
+    "set_password_hasher",
+    "shutdown_password_hasher"
 ]
\ No newline at end of file
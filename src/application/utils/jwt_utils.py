@@ -1,21 +1,130 @@
 """
 认证服务 - JWT工具类
 """
+import base64
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import jwt
+from jwt.algorithms import get_default_algorithms
 from saturn_mousehunter_shared.log.logger import get_logger
-from infrastructure.config.app_config import JWTConfig
+from infrastructure.config.app_config import JWTConfig, JWTKey, get_jwt_config
+from .token_cache import TokenCache
+from .permission_codec import get_permission_codec
+from .permission_registry import get_permission_registry, get_role_registry
+from .principal import Principal
 
 log = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class _RingKey:
+    """已解析的密钥环条目"""
+    kid: str
+    algorithm: str
+    algorithms: List[str]
+    signing_key: Any
+    verification_key: Any
+    public_jwk: Optional[Dict[str, Any]]
+
+
+def _load_key(key: JWTKey) -> _RingKey:
+    """解析密钥并派生 kid"""
+    if not key.is_asymmetric:
+        kid = key.kid or hmac.new(
+            key.secret_key.encode(), b"saturn-mousehunter-kid", hashlib.sha256
+        ).hexdigest()[:16]  # 对称密钥不能暴露摘要，使用HMAC派生
+        return _RingKey(kid, key.algorithm, [key.algorithm], key.secret_key, key.secret_key, None)
+
+    algorithm = get_default_algorithms()[key.algorithm]
+    private_key = algorithm.prepare_key(key.private_key) if key.private_key else None
+    if key.public_key:
+        public_key = algorithm.prepare_key(key.public_key)
+    else:
+        public_key = private_key.public_key()
+
+    public_jwk = algorithm.to_jwk(public_key, as_dict=True)
+    public_jwk.update({"use": "sig", "alg": key.algorithm})
+
+    kid = key.kid
+    if not kid:
+        # RFC 7638 JWK Thumbprint
+        required = {k: v for k, v in public_jwk.items() if k in ("crv", "e", "kty", "n", "x", "y")}
+        canonical = json.dumps(required, sort_keys=True, separators=(",", ":")).encode()
+        kid = base64.urlsafe_b64encode(hashlib.sha256(canonical).digest()).rstrip(b"=").decode()
+
+    return _RingKey(kid, key.algorithm, [key.algorithm], private_key, public_key, dict(public_jwk, kid=kid))
+
+
 class JWTUtils:
     """JWT工具类"""
 
     def __init__(self, jwt_config: JWTConfig):
         self.config = jwt_config
 
+        # 构造时一次性准备签名/验签所需的密钥、算法列表和发行者，避免每次请求重复计算
+        signing = _load_key(jwt_config.signing_key)
+        self._signing_key = signing.signing_key
+        self._key_id = signing.kid
+        self._headers = {"kid": self._key_id}
+        self._algorithm = jwt_config.algorithm
+        self._issuer = jwt_config.issuer
+        self._access_token_ttl = timedelta(minutes=jwt_config.access_token_expire_minutes)
+        self._refresh_token_ttl = timedelta(days=jwt_config.refresh_token_expire_days)
+        self._compact_permissions = jwt_config.compact_permissions
+        self._permission_codec = get_permission_codec()
+
+        # 密钥环：kid -> 验签密钥，解码时按令牌头的 kid 直接定位，不逐个尝试
+        self._default_key = signing
+        self._key_ring: Dict[str, _RingKey] = {signing.kid: signing}
+        for previous in jwt_config.previous_keys:
+            ring_key = _load_key(previous)
+            if ring_key.kid in self._key_ring:
+                log.warning(f"Duplicate JWT key id ignored: {ring_key.kid}")
+                continue
+            self._key_ring[ring_key.kid] = ring_key
+
+        # 已验证访问令牌缓存（随校验器一起轮换）
+        self._token_cache = (
+            TokenCache(jwt_config.verify_cache_size) if jwt_config.verify_cache_size > 0 else None
+        )
+
+        # JWKS文档只依赖密钥，预先序列化；轮换期间新旧公钥同时发布
+        jwks_keys = [k.public_jwk for k in self._key_ring.values() if k.public_jwk]
+        self._jwks_body = json.dumps({"keys": jwks_keys}, separators=(",", ":")).encode()
+        self._jwks_etag = f'"{hashlib.sha256(self._jwks_body).hexdigest()[:16]}"'
+
+    @property
+    def key_id(self) -> str:
+        return self._key_id
+
+    @property
+    def key_ids(self) -> List[str]:
+        """密钥环中所有可用于验签的 kid"""
+        return list(self._key_ring)
+
+    def get_jwks(self) -> bytes:
+        """获取预序列化的JWKS文档（对称算法不公开任何密钥）"""
+        return self._jwks_body
+
+    @property
+    def jwks_etag(self) -> str:
+        return self._jwks_etag
+
+    def _select_key(self, token: str) -> _RingKey:
+        """按令牌头的 kid 选择验签密钥，无 kid 的旧令牌使用当前签名密钥"""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            return self._default_key
+
+        ring_key = self._key_ring.get(kid)
+        if ring_key is None:
+            raise jwt.InvalidTokenError(f"Unknown key id: {kid}")
+        return ring_key
+
     def create_access_token(self,
                            subject: str,
                            user_type: str,
@@ -25,12 +134,7 @@ class JWTUtils:
                            expires_delta: Optional[timedelta] = None,
                            additional_claims: Dict[str, Any] = None) -> str:
         """创建访问令牌"""
-        if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=self.config.access_token_expire_minutes
-            )
+        expire = datetime.now(timezone.utc) + (expires_delta or self._access_token_ttl)
 
         claims = {
             "sub": subject,  # 主题（用户标识）
@@ -38,12 +142,19 @@ class JWTUtils:
             "user_id": user_id,
             "exp": expire,
             "iat": datetime.now(timezone.utc),
-            "iss": self.config.issuer,
+            "iss": self._issuer,
             "type": "access_token"
         }
 
         if permissions:
-            claims["permissions"] = permissions
+            if self._compact_permissions:
+                # 字典内权限编码为位图，字典外的保留原始编码
+                claims["pv"] = self._permission_codec.version
+                claims["pb"], overflow = self._permission_codec.encode(permissions)
+                if overflow:
+                    claims["permissions"] = overflow
+            else:
+                claims["permissions"] = permissions
 
         if roles:
             claims["roles"] = roles
@@ -54,8 +165,9 @@ class JWTUtils:
         try:
             token = jwt.encode(
                 claims,
-                self.config.secret_key,
-                algorithm=self.config.algorithm
+                self._signing_key,
+                algorithm=self._algorithm,
+                headers=self._headers
             )
             log.debug(f"Created access token for user: {user_id}")
             return token
@@ -70,12 +182,7 @@ class JWTUtils:
                             expires_delta: Optional[timedelta] = None,
                             additional_claims: Dict[str, Any] = None) -> str:
         """创建刷新令牌"""
-        if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                days=self.config.refresh_token_expire_days
-            )
+        expire = datetime.now(timezone.utc) + (expires_delta or self._refresh_token_ttl)
 
         claims = {
             "sub": subject,
@@ -83,7 +190,7 @@ class JWTUtils:
             "user_id": user_id,
             "exp": expire,
             "iat": datetime.now(timezone.utc),
-            "iss": self.config.issuer,
+            "iss": self._issuer,
             "type": "refresh_token"
         }
 
@@ -93,8 +200,9 @@ class JWTUtils:
         try:
             token = jwt.encode(
                 claims,
-                self.config.secret_key,
-                algorithm=self.config.algorithm
+                self._signing_key,
+                algorithm=self._algorithm,
+                headers=self._headers
             )
             log.debug(f"Created refresh token for user: {user_id}")
             return token
@@ -102,14 +210,15 @@ class JWTUtils:
             log.error(f"Failed to create refresh token: {e}")
             raise
 
-    def decode_token(self, token: str) -> Dict[str, Any]:
+    def decode_token(self, token: str, verify_exp: bool = True) -> Dict[str, Any]:
         """解码JWT令牌"""
         try:
+            ring_key = self._select_key(token)
             payload = jwt.decode(
                 token,
-                self.config.secret_key,
-                algorithms=[self.config.algorithm],
-                options={"verify_exp": True}
+                ring_key.verification_key,
+                algorithms=ring_key.algorithms,
+                options={"verify_exp": verify_exp}
             )
             return payload
         except jwt.ExpiredSignatureError:
@@ -122,19 +231,25 @@ class JWTUtils:
             log.error(f"Failed to decode token: {e}")
             raise ValueError("令牌解析失败")
 
+    def check_claims(self, payload: Dict[str, Any], token_type: str = None) -> bool:
+        """校验已解码载荷的令牌类型和发行者"""
+        # 验证令牌类型
+        if token_type and payload.get("type") != token_type:
+            log.warning(f"Token type mismatch. Expected: {token_type}, Got: {payload.get('type')}")
+            return False
+
+        # 验证发行者
+        if payload.get("iss") != self._issuer:
+            log.warning(f"Invalid issuer: {payload.get('iss')}")
+            return False
+
+        return True
+
     def verify_token(self, token: str, token_type: str = None) -> Optional[Dict[str, Any]]:
         """验证JWT令牌"""
         try:
             payload = self.decode_token(token)
-
-            # 验证令牌类型
-            if token_type and payload.get("type") != token_type:
-                log.warning(f"Token type mismatch. Expected: {token_type}, Got: {payload.get('type')}")
-                return None
-
-            # 验证发行者
-            if payload.get("iss") != self.config.issuer:
-                log.warning(f"Invalid issuer: {payload.get('iss')}")
+            if not self.check_claims(payload, token_type):
                 return None
 
             return payload
@@ -148,27 +263,59 @@ class JWTUtils:
 
     def extract_user_info(self, token: str) -> Optional[Dict[str, Any]]:
         """从令牌中提取用户信息"""
+        if self._token_cache is not None:
+            cached = self._token_cache.get(token)
+            if cached is not None:
+                return dict(cached)
+
         payload = self.verify_token(token, "access_token")
         if not payload:
             return None
 
-        return {
+        codec = self._permission_codec
+        permissions = payload.get("permissions", [])
+        if "pb" in payload:
+            if payload.get("pv") != codec.version:
+                # 权限字典版本不一致，要求客户端刷新令牌
+                log.warning(f"Permission dictionary version mismatch: {payload.get('pv')} != {codec.version}")
+                return None
+            permission_bits = codec.decode_bits(payload["pb"])
+            permission_overflow = frozenset(permissions)
+            permissions = codec.expand(permission_bits) + permissions
+        else:
+            permission_bits, permission_overflow = codec.compile(permissions)
+
+        user_info = {
             "user_id": payload.get("user_id"),
             "user_type": payload.get("user_type"),
             "subject": payload.get("sub"),
-            "permissions": payload.get("permissions", []),
+            "permissions": permissions,
+            "permission_bits": permission_bits,
+            "permission_overflow": permission_overflow,
             "roles": payload.get("roles", []),
+            "tenant_id": payload.get("tenant_id"),
             "expires_at": datetime.fromtimestamp(payload.get("exp"), tz=timezone.utc),
             "issued_at": datetime.fromtimestamp(payload.get("iat"), tz=timezone.utc)
         }
 
+        if self._token_cache is not None:
+            self._token_cache.put(token, user_info, payload.get("exp"))
+            return dict(user_info)
+
+        return user_info
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """获取已验证令牌缓存统计"""
+        return self._token_cache.get_stats() if self._token_cache is not None else None
+
     def get_token_expiry(self, token: str) -> Optional[datetime]:
         """获取令牌过期时间"""
         try:
+            ring_key = self._select_key(token)
             payload = jwt.decode(
                 token,
-                self.config.secret_key,
-                algorithms=[self.config.algorithm],
+                ring_key.verification_key,
+                algorithms=ring_key.algorithms,
                 options={"verify_exp": False}  # 不验证过期时间，只获取信息
             )
             exp = payload.get("exp")
@@ -247,21 +394,18 @@ class JWTUtils:
         if not user_info:
             return False
 
-        user_permissions = set(user_info.get("permissions", []))
-        user_roles = set(user_info.get("roles", []))
+        principal = Principal(user_info)
 
         # 检查权限
         if required_permissions:
-            required_perms = set(required_permissions)
-            if not required_perms.issubset(user_permissions):
-                log.warning(f"Insufficient permissions. Required: {required_permissions}, Got: {list(user_permissions)}")
+            if not principal.has_all_permissions(get_permission_registry().mask(required_permissions)):
+                log.warning(f"Insufficient permissions. Required: {required_permissions}, Got: {user_info.get('permissions', [])}")
                 return False
 
         # 检查角色
         if required_roles:
-            required_role_set = set(required_roles)
-            if not required_role_set.intersection(user_roles):  # 至少有一个匹配的角色
-                log.warning(f"Insufficient roles. Required one of: {required_roles}, Got: {list(user_roles)}")
+            if not principal.has_any_role(get_role_registry().mask(required_roles)):  # 至少有一个匹配的角色
+                log.warning(f"Insufficient roles. Required one of: {required_roles}, Got: {user_info.get('roles', [])}")
                 return False
 
         return True
@@ -277,4 +421,32 @@ class JWTUtils:
             return payload
         except Exception as e:
             log.error(f"Failed to decode token payload: {e}")
-            return None
\ No newline at end of file
+            return None
+
+# 进程级共享的JWT校验器，由 main.py 在 lifespan 中创建，密钥轮换时整体替换
+_jwt_verifier: Optional[JWTUtils] = None
+
+
+def get_jwt_verifier() -> JWTUtils:
+    """获取共享的JWT工具（未初始化时按环境变量配置创建）"""
+    global _jwt_verifier
+    if _jwt_verifier is None:
+        _jwt_verifier = JWTUtils(get_jwt_config())
+    return _jwt_verifier
+
+
+def set_jwt_verifier(jwt_utils: Optional[JWTUtils]) -> None:
+    """设置共享的JWT工具"""
+    global _jwt_verifier
+    _jwt_verifier = jwt_utils
+
+
+def rotate_jwt_verifier(jwt_config: Optional[JWTConfig] = None) -> JWTUtils:
+    """密钥轮换：用新配置构建校验器后原子替换，进行中的请求继续使用旧实例"""
+    new_verifier = JWTUtils(jwt_config or get_jwt_config())
+    set_jwt_verifier(new_verifier)
+    log.info(
+        f"JWT verifier rotated: algorithm={new_verifier.config.algorithm}, "
+        f"signing_kid={new_verifier.key_id}, ring={new_verifier.key_ids}"
+    )
+    return new_verifier
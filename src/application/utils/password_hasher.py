@@ -0,0 +1,124 @@
+"""
+认证服务 - 异步密码哈希引擎
+
+bcrypt 单次计算约 200-300ms，直接在事件循环中调用会阻塞同一 worker 上的所有请求。
+这里把哈希/校验放到有界线程池（或进程池）中执行，并通过队列深度限制实现背压。
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from saturn_mousehunter_shared.log.logger import get_logger
+from infrastructure.config.app_config import PasswordHashingConfig, get_password_hashing_config
+from .password_utils import PasswordUtils
+
+log = get_logger(__name__)
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """密码哈希队列已满"""
+
+    def __init__(self, retry_after_seconds: int = 1):
+        super().__init__("密码服务繁忙，请稍后重试")
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AsyncPasswordHasher:
+    """基于有界工作池的异步密码哈希器"""
+
+    def __init__(self, config: PasswordHashingConfig):
+        self.config = config
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(config.max_pending)
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.config.executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.config.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    thread_name_prefix="password-hasher"
+                )
+            log.info(
+                f"Password hasher started: executor={self.config.executor}, "
+                f"workers={self.config.max_workers}, max_pending={self.config.max_pending}"
+            )
+        return self._executor
+
+    async def _submit(self, func: Callable, *args) -> Any:
+        """提交任务到工作池，队列满时等待 queue_timeout 后拒绝"""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.config.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            log.warning(f"Password hasher queue full, rejected request (in_flight={self._in_flight})")
+            raise PasswordHasherBusyError(retry_after_seconds=max(1, round(self.config.queue_timeout_seconds)))
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._slots.release()
+
+    async def hash_password(self, password: str) -> str:
+        """异步哈希密码"""
+        if not password:
+            raise ValueError("密码不能为空")
+        return await self._submit(PasswordUtils.hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """异步验证密码"""
+        if not plain_password or not hashed_password:
+            return False
+        return await self._submit(PasswordUtils.verify_password, plain_password, hashed_password)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取工作池状态"""
+        return {
+            "executor": self.config.executor,
+            "max_workers": self.config.max_workers,
+            "max_pending": self.config.max_pending,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        """关闭工作池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            log.info("Password hasher stopped")
+
+
+# 进程级共享实例，由 main.py 在 lifespan 中创建和关闭
+_password_hasher: Optional[AsyncPasswordHasher] = None
+
+
+def get_password_hasher() -> AsyncPasswordHasher:
+    """获取共享的密码哈希器（未初始化时按环境变量配置创建）"""
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = AsyncPasswordHasher(get_password_hashing_config())
+    return _password_hasher
+
+
+def set_password_hasher(password_hasher: Optional[AsyncPasswordHasher]) -> None:
+    """设置共享的密码哈希器"""
+    global _password_hasher
+    _password_hasher = password_hasher
+
+
+def shutdown_password_hasher() -> None:
+    """关闭共享的密码哈希器"""
+    global _password_hasher
+    if _password_hasher is not None:
+        _password_hasher.shutdown()
+        _password_hasher = None
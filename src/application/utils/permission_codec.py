@@ -0,0 +1,92 @@
+"""
+认证服务 - 权限紧凑编码
+
+把访问令牌中的权限列表编码为版本化权限字典上的位图（base64url），
+字典外的权限编码仍以列表形式保留。位图与权限注册表的前缀一致，校验时无需还原为列表。
+"""
+import base64
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# 权限字典：只允许在末尾追加；调整顺序或删除条目必须提升版本号
+PERMISSION_DICTIONARY_VERSION = 1
+PERMISSION_DICTIONARY: Tuple[str, ...] = (
+    # Saturn MHC 菜单权限
+    "menu:dashboard",
+    "menu:market_config",
+    "menu:trading_calendar",
+    "trading_calendar:read",
+    "trading_calendar:write",
+    "menu:instrument_pool",
+    "menu:benchmark_pool",
+    "menu:pool_intersection",
+    "menu:proxy_pool",
+    "menu:kline_management",
+    "menu:cookie_management",
+    "menu:auth_service",
+    "menu:user_management",
+    "user:read",
+    "menu:role_management",
+    "role:read",
+    "menu:permission_management",
+    "menu:strategy_engine",
+    "menu:universe",
+    "menu:api_explorer",
+    "menu:table_demo",
+    "menu:skin_theme_demo",
+    "menu:logs",
+    # 系统内置权限
+    "user:write",
+    "strategy:read",
+    "strategy:write",
+    "risk:read",
+    "risk:write",
+)
+
+
+class PermissionCodec:
+    """基于权限字典的位图编解码器"""
+
+    def __init__(self,
+                 dictionary: Tuple[str, ...] = PERMISSION_DICTIONARY,
+                 version: int = PERMISSION_DICTIONARY_VERSION):
+        self.version = version
+        self.dictionary = dictionary
+        self._index: Dict[str, int] = {code: i for i, code in enumerate(dictionary)}
+
+    def compile(self, permissions: Iterable[str]) -> Tuple[int, FrozenSet[str]]:
+        """权限列表 -> (字典内位图, 字典外权限集合)"""
+        bits = 0
+        overflow = set()
+        for code in permissions:
+            position = self._index.get(code)
+            if position is None:
+                overflow.add(code)
+            else:
+                bits |= 1 << position
+        return bits, frozenset(overflow)
+
+    def encode(self, permissions: Iterable[str]) -> Tuple[str, List[str]]:
+        """权限列表 -> (base64url位图, 字典外权限列表)"""
+        bits, overflow = self.compile(permissions)
+        raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode(), sorted(overflow)
+
+    def decode_bits(self, encoded: str) -> int:
+        """base64url位图 -> 整数位图"""
+        raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        return int.from_bytes(raw, "little")
+
+    def expand(self, bits: int) -> List[str]:
+        """位图 -> 权限列表（仅用于展示，校验不需要展开）"""
+        return [code for i, code in enumerate(self.dictionary) if bits >> i & 1]
+
+
+_permission_codec: Optional[PermissionCodec] = None
+
+
+def get_permission_codec() -> PermissionCodec:
+    """获取进程级共享的权限编解码器"""
+    global _permission_codec
+    if _permission_codec is None:
+        _permission_codec = PermissionCodec()
+    return _permission_codec
@@ -0,0 +1,185 @@
+"""
+认证服务 - 权限位注册表
+
+依赖项创建时把所需的权限/角色编码登记为整数位，请求到来时把用户声明一次性转换为位掩码
+（缓存在请求级的 Principal 上），之后每次校验只需一次按位与比较。
+权限注册表以权限字典为前缀，令牌中的 pb 位图可直接使用。
+
+通配符授权（strategy:*、menu:admin.*）通过已登记编码构成的前缀树展开：每个节点保存其下
+所有编码的位掩码，展开一个通配符只需沿前缀走一遍，与已登记编码的数量无关。
+通配符只在"持有"一侧展开；作为"要求"时按字面登记为一位，用户必须持有该通配符或覆盖它的更短通配符。
+"""
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .permission_codec import PERMISSION_DICTIONARY
+
+WILDCARD = "*"
+
+
+def is_wildcard(code: str) -> bool:
+    """是否为通配符授权（只允许出现在末尾）"""
+    return code.endswith(WILDCARD)
+
+
+class _TrieNode:
+    __slots__ = ("children", "mask")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.mask = 0  # 以该节点为前缀的所有编码
+
+
+class PermissionRegistry:
+    """编码 -> 位序号的只增注册表"""
+
+    def __init__(self, seed: Iterable[str] = ()):
+        self._codes: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._trie = _TrieNode()
+        self._lock = threading.Lock()
+        for code in seed:
+            self.intern(code)
+
+    @property
+    def generation(self) -> int:
+        """已登记的编码数量，只增不减"""
+        return len(self._codes)
+
+    def intern(self, code: str) -> int:
+        """登记编码并返回位序号"""
+        position = self._positions.get(code)
+        if position is None:
+            with self._lock:
+                position = self._positions.get(code)
+                if position is None:
+                    position = len(self._codes)
+                    bit = 1 << position
+                    node = self._trie
+                    node.mask |= bit
+                    for char in code:
+                        node = node.children.setdefault(char, _TrieNode())
+                        node.mask |= bit
+                    self._codes.append(code)
+                    self._positions[code] = position
+        return position
+
+    def prefix_mask(self, prefix: str) -> int:
+        """以 prefix 开头的所有已登记编码的位掩码"""
+        node = self._trie
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return 0
+        return node.mask
+
+    def position(self, code: str) -> Optional[int]:
+        """查找已登记编码的位序号（不登记）"""
+        return self._positions.get(code)
+
+    def mask(self, codes: Iterable[str]) -> int:
+        """登记并计算所需编码的位掩码（依赖项创建时调用），通配符按字面登记，不展开"""
+        mask = 0
+        for code in codes:
+            mask |= 1 << self.intern(code)
+        return mask
+
+    def lookup_mask(self, codes: Iterable[str]) -> int:
+        """计算持有编码的位掩码：通配符展开为其下所有已登记编码（含被要求的更长通配符），
+        未登记的具体编码不可能被要求，直接忽略"""
+        mask = 0
+        positions = self._positions
+        for code in codes:
+            if is_wildcard(code):
+                mask |= self.prefix_mask(code[:-1])
+            else:
+                position = positions.get(code)
+                if position is not None:
+                    mask |= 1 << position
+        return mask
+
+    def grant_mask(self, codes: Iterable[str]) -> int:
+        """登记持有的具体编码并计算位掩码，通配符展开"""
+        codes = list(codes)
+        for code in codes:
+            if not is_wildcard(code):
+                self.intern(code)
+        return self.lookup_mask(codes)
+
+    def codes_of(self, mask: int) -> List[str]:
+        """位掩码 -> 编码列表（仅用于日志和提示）"""
+        return [code for i, code in enumerate(self._codes) if mask >> i & 1]
+
+
+class PermissionSet:
+    """
+    编译后的用户权限集合，支持通配符
+
+    已登记编码的判定是一次位运算；未登记的编码只可能被通配符命中，按用户自己的通配符前缀判断。
+    掩码在注册表有新登记时重新计算。
+    """
+
+    def __init__(self, codes: Iterable[str], registry: Optional[PermissionRegistry] = None):
+        self.registry = registry if registry is not None else get_permission_registry()
+        self.codes: FrozenSet[str] = frozenset(codes)
+        self.prefixes: Tuple[str, ...] = tuple(code[:-1] for code in self.codes if is_wildcard(code))
+        self._generation = -1
+        self._mask = 0
+
+    @property
+    def mask(self) -> int:
+        generation = self.registry.generation
+        if generation != self._generation:
+            self._mask = self.registry.lookup_mask(self.codes)
+            self._generation = generation
+        return self._mask
+
+    def __contains__(self, code: str) -> bool:
+        if code in self.codes:
+            return True
+        if not self.prefixes:
+            return False
+        position = self.registry.position(code)
+        if position is not None:
+            return bool(self.mask >> position & 1)
+        return code.startswith(self.prefixes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+_permission_registry: Optional[PermissionRegistry] = None
+_role_registry: Optional[PermissionRegistry] = None
+
+
+def get_permission_registry() -> PermissionRegistry:
+    """获取权限注册表（前缀与权限字典一致）"""
+    global _permission_registry
+    if _permission_registry is None:
+        _permission_registry = PermissionRegistry(PERMISSION_DICTIONARY)
+    return _permission_registry
+
+
+def get_role_registry() -> PermissionRegistry:
+    """获取角色注册表"""
+    global _role_registry
+    if _role_registry is None:
+        _role_registry = PermissionRegistry()
+    return _role_registry
+
+
+def compute_user_masks(user_info: Dict[str, Any]) -> Tuple[int, int]:
+    """把用户声明转换为 (权限掩码, 角色掩码)"""
+    permissions = get_permission_registry()
+    if "permission_bits" in user_info:
+        # 字典内权限直接取令牌位图，只需查找字典外的编码
+        permission_mask = user_info["permission_bits"] | permissions.lookup_mask(
+            user_info.get("permission_overflow", ())
+        )
+    else:
+        permission_mask = permissions.lookup_mask(user_info.get("permissions", []))
+
+    return permission_mask, get_role_registry().lookup_mask(user_info.get("roles", []))
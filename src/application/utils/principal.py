@@ -0,0 +1,80 @@
+"""
+认证服务 - 请求级认证主体
+
+每个请求只解析一次令牌，构造 Principal 并挂在 request.state 上，所有鉴权依赖共享同一实例。
+Principal 继承 dict，原有按键读取用户信息的代码无需修改。
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from .permission_registry import compute_user_masks, get_permission_registry, get_role_registry, is_wildcard
+
+
+class Principal(dict):
+    """认证主体：预索引的角色/权限集合和位掩码"""
+
+    def __init__(self, user_info: Dict[str, Any]):
+        super().__init__(user_info)
+        self.user_id: Optional[str] = user_info.get("user_id")
+        self.user_type: Optional[str] = user_info.get("user_type")
+        self.subject: Optional[str] = user_info.get("subject")
+        self.tenant_id: Optional[str] = user_info.get("tenant_id")
+        self.expires_at: Optional[datetime] = user_info.get("expires_at")
+        self.issued_at: Optional[datetime] = user_info.get("issued_at")
+        self.permissions: FrozenSet[str] = frozenset(user_info.get("permissions", ()))
+        self.roles: FrozenSet[str] = frozenset(user_info.get("roles", ()))
+        self._wildcard_prefixes: Tuple[str, ...] = tuple(code[:-1] for code in self.permissions if is_wildcard(code))
+        self._masks: Optional[Tuple[Tuple[int, int], int, int]] = None
+
+    @classmethod
+    def of(cls, user: Dict[str, Any]) -> "Principal":
+        """已是 Principal 时直接返回，否则从用户信息字典构造"""
+        return user if isinstance(user, cls) else cls(user)
+
+    def masks(self) -> Tuple[int, int]:
+        """(权限掩码, 角色掩码)，注册表有新登记时重新计算"""
+        generation = (get_permission_registry().generation, get_role_registry().generation)
+        if self._masks is None or self._masks[0] != generation:
+            self._masks = (generation, *compute_user_masks(self))
+        return self._masks[1], self._masks[2]
+
+    @property
+    def is_admin(self) -> bool:
+        return self.user_type == "ADMIN"
+
+    @property
+    def is_tenant(self) -> bool:
+        return self.user_type == "TENANT"
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        if self.expires_at is None:
+            return True
+        return (now or datetime.now(timezone.utc)) >= self.expires_at
+
+    def has_permission(self, permission_code: str) -> bool:
+        if permission_code in self.permissions:
+            return True
+        if not self._wildcard_prefixes:
+            return False
+        # 通配符授权：已登记编码查掩码，未登记编码按前缀判断
+        position = get_permission_registry().position(permission_code)
+        if position is not None:
+            return bool(self.masks()[0] >> position & 1)
+        return permission_code.startswith(self._wildcard_prefixes)
+
+    def has_role(self, role_code: str) -> bool:
+        return role_code in self.roles
+
+    def has_all_permissions(self, required_mask: int) -> bool:
+        """是否拥有掩码中的全部权限（空掩码视为配置错误，拒绝）"""
+        if not required_mask:
+            return False
+        return self.masks()[0] & required_mask == required_mask
+
+    def has_any_permission(self, required_mask: int) -> bool:
+        """是否拥有掩码中的任意权限"""
+        return bool(self.masks()[0] & required_mask)
+
+    def has_any_role(self, required_mask: int) -> bool:
+        """是否拥有掩码中的任意角色"""
+        return bool(self.masks()[1] & required_mask)
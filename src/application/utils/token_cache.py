@@ -0,0 +1,78 @@
+"""
+认证服务 - 已验证令牌缓存
+
+同一个访问令牌在有效期内会被反复提交，缓存以令牌摘要为键保存解析后的用户信息，
+命中时跳过签名校验和JSON解析。条目的过期时间不超过令牌本身的 exp。
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenCache:
+    """按令牌SHA-256摘要索引的有界LRU缓存"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """获取缓存的用户信息，过期或未命中返回None"""
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def put(self, token: str, value: Dict[str, Any], expires_at: float) -> None:
+        """写入缓存，expires_at 为令牌 exp（Unix时间戳）"""
+        if expires_at <= time.time():
+            return
+
+        key = self._digest(token)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,78 @@
+"""
+认证服务 - 令牌自省引擎
+
+对每个令牌只做一次签名校验解码，并从同一份载荷推导出有效性、过期状态和剩余有效期。
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from .jwt_utils import JWTUtils
+
+
+@dataclass
+class TokenStatus:
+    """令牌状态"""
+    valid: bool
+    expired: bool
+    expires_at: Optional[datetime] = None
+    issued_at: Optional[datetime] = None
+    user_id: Optional[str] = None
+    user_type: Optional[str] = None
+    time_until_expiry: Optional[int] = None  # 剩余秒数
+
+
+class TokenIntrospector:
+    """令牌自省引擎"""
+
+    def __init__(self, jwt_utils: JWTUtils):
+        self.jwt_utils = jwt_utils
+
+    def introspect(self, token: str, now: Optional[datetime] = None) -> TokenStatus:
+        """自省单个令牌"""
+        now = now or datetime.now(timezone.utc)
+
+        try:
+            # 校验签名但不校验过期，过期状态由下面根据 exp 计算
+            payload = self.jwt_utils.decode_token(token, verify_exp=False)
+        except ValueError:
+            return TokenStatus(valid=False, expired=True)
+
+        exp = payload.get("exp")
+        if not exp:
+            # 无法获取过期时间，认为已过期
+            return TokenStatus(valid=False, expired=True)
+
+        expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
+        if now > expires_at:
+            return TokenStatus(valid=False, expired=True, expires_at=expires_at)
+
+        if not self.jwt_utils.check_claims(payload, "access_token"):
+            return TokenStatus(
+                valid=False,
+                expired=False,
+                expires_at=expires_at,
+                time_until_expiry=int((expires_at - now).total_seconds())
+            )
+
+        iat = payload.get("iat")
+        return TokenStatus(
+            valid=True,
+            expired=False,
+            expires_at=expires_at,
+            issued_at=datetime.fromtimestamp(iat, tz=timezone.utc) if iat else None,
+            user_id=payload.get("user_id"),
+            user_type=payload.get("user_type"),
+            time_until_expiry=int((expires_at - now).total_seconds())
+        )
+
+    def introspect_many(self, tokens: List[str]) -> List[TokenStatus]:
+        """批量自省令牌，共用同一时间基准，重复令牌只解码一次"""
+        now = datetime.now(timezone.utc)
+        results: Dict[str, TokenStatus] = {}
+
+        for token in tokens:
+            if token not in results:
+                results[token] = self.introspect(token, now)
+
+        return [results[token] for token in tokens]
@@ -11,7 +11,7 @@ class PermissionBase(BaseModel):
     permission_name: str = Field(..., min_length=2, max_length=100, description="权限名称")
     permission_code: str = Field(..., min_length=2, max_length=100, description="权限编码")
     resource: str = Field(..., min_length=2, max_length=100, description="资源名称")
-    action: str = Field(..., min_length=2, max_length=50, description="操作类型")
+    action: str = Field(..., min_length=1, max_length=50, description="操作类型（* 表示全部操作）")
     description: Optional[str] = Field(None, description="权限描述")
     is_system_permission: bool = Field(False, description="是否系统权限")
 
@@ -26,11 +26,14 @@ class PermissionBase(BaseModel):
         resource, action = parts
         if not resource or not action:
             raise ValueError('资源名和操作不能为空')
+        # 通配符只能出现在末尾的一个层级上，如 strategy:* 或 menu:admin.*
+        if '*' in v and not (v.count('*') == 1 and (v.endswith(':*') or v.endswith('.*'))):
+            raise ValueError('通配符只能以 :* 或 .* 结尾')
         return v.lower()
 
     @validator('action')
     def validate_action(cls, v):
-        valid_actions = {'create', 'read', 'update', 'delete', 'write', 'execute', 'manage'}
+        valid_actions = {'create', 'read', 'update', 'delete', 'write', 'execute', 'manage', '*'}
         if v.lower() not in valid_actions:
             raise ValueError(f'操作类型必须是以下之一: {", ".join(valid_actions)}')
         return v.lower()
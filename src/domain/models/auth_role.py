@@ -23,6 +23,7 @@ class RoleBase(BaseModel):
     scope: RoleScope = Field(RoleScope.GLOBAL, description="角色范围")
     is_system_role: bool = Field(False, description="是否系统角色")
     is_active: bool = Field(True, description="是否激活")
+    parent_role_id: Optional[str] = Field(None, description="父角色ID，继承父角色及其祖先的权限")
 
     @validator('role_code')
     def validate_role_code(cls, v):
@@ -42,6 +43,7 @@ class RoleUpdate(BaseModel):
     description: Optional[str] = None
     scope: Optional[RoleScope] = None
     is_active: Optional[bool] = None
+    parent_role_id: Optional[str] = None  # 显式传null解除继承
 
     # 系统角色不允许修改编码和系统标识
 
@@ -0,0 +1,43 @@
+"""
+认证服务 - 进程内缓存
+"""
+
+from .permission_cache import (
+    PermissionCache, get_permission_cache, set_permission_cache
+)
+from .menu_tree_cache import (
+    MenuTreeCache, get_menu_tree_cache, set_menu_tree_cache
+)
+from .role_permission_projection import (
+    RolePermissionProjection, get_role_permission_projection, set_role_permission_projection
+)
+from .invalidation_bus import (
+    InvalidationBus, RESYNC, get_invalidation_bus, set_invalidation_bus, publish_invalidation
+)
+from .rbac_invalidation import (
+    USER_ROLES_CHANGED, ROLE_CHANGED, PERMISSION_CHANGED, ROLE_PERMISSIONS_CHANGED, MENUS_CHANGED,
+    register_rbac_handlers
+)
+
+__all__ = [
+    "PermissionCache",
+    "get_permission_cache",
+    "set_permission_cache",
+    "MenuTreeCache",
+    "get_menu_tree_cache",
+    "set_menu_tree_cache",
+    "RolePermissionProjection",
+    "get_role_permission_projection",
+    "set_role_permission_projection",
+    "InvalidationBus",
+    "RESYNC",
+    "get_invalidation_bus",
+    "set_invalidation_bus",
+    "publish_invalidation",
+    "USER_ROLES_CHANGED",
+    "ROLE_CHANGED",
+    "PERMISSION_CHANGED",
+    "ROLE_PERMISSIONS_CHANGED",
+    "MENUS_CHANGED",
+    "register_rbac_handlers"
+]
@@ -0,0 +1,182 @@
+"""
+认证服务 - 跨进程缓存失效总线
+
+多 worker 部署时各进程的内存缓存相互独立。写操作通过 pg_notify 广播变更事件，
+每个 worker 用一条专用连接 LISTEN 同一频道，只失效受影响的键。监听连接断开期间可能丢失事件，
+重连后触发全量重同步。NOTIFY 负载上限为 8000 字节，超出时只广播标量字段并附带 reload 标记，
+由接收方从数据库重新加载。
+"""
+import asyncio
+import inspect
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import asyncpg
+from saturn_mousehunter_shared.log.logger import get_logger
+from infrastructure.db.base_dao import AsyncDAO
+
+log = get_logger(__name__)
+
+CHANNEL = "mh_auth_invalidation"
+RESYNC = "resync"  # 监听中断或事件无法完整广播时需要全量重建缓存
+MAX_PAYLOAD_BYTES = 8000  # Postgres 拒绝不小于该长度的 NOTIFY 负载
+
+Handler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class InvalidationBus:
+    """基于 Postgres LISTEN/NOTIFY 的失效事件总线"""
+
+    def __init__(self, dao: AsyncDAO, channel: str = CHANNEL, reconnect_delay_seconds: float = 1.0):
+        self.dao = dao
+        self.channel = channel
+        self.origin = uuid.uuid4().hex  # 本进程标识，忽略自己发出的事件
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._conn: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()  # 事件循环只弱引用任务，异步处理器在此持有强引用
+        self._closing = False
+        self._published = 0
+        self._received = 0
+
+    def subscribe(self, kind: str, handler: Handler) -> None:
+        """订阅某类事件"""
+        self._handlers.setdefault(kind, []).append(handler)
+
+    async def start(self) -> None:
+        """建立专用监听连接"""
+        self._closing = False
+        self._conn = await asyncpg.connect(self.dao.connection_string)
+        await self._conn.add_listener(self.channel, self._on_notify)
+        self._conn.add_termination_listener(self._on_terminated)
+        log.info(f"Invalidation bus listening on channel: {self.channel}")
+
+    async def stop(self) -> None:
+        """关闭监听连接"""
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        for task in list(self._tasks):
+            task.cancel()
+        if self._conn is not None:
+            try:
+                await self._conn.remove_listener(self.channel, self._on_notify)
+                await self._conn.close()
+            except Exception as e:
+                log.warning(f"Invalidation bus close failed: {e}")
+            self._conn = None
+        log.info("Invalidation bus stopped")
+
+    def _encode(self, kind: str, payload: Dict[str, Any]) -> str:
+        message = json.dumps({"origin": self.origin, "kind": kind, **payload}, separators=(",", ":"), default=str)
+        if len(message.encode()) < MAX_PAYLOAD_BYTES:
+            return message
+
+        # 负载过大：去掉集合类字段，接收方按 reload 标记从数据库重新加载
+        compact = {k: v for k, v in payload.items() if v is None or isinstance(v, (str, int, float, bool))}
+        message = json.dumps({"origin": self.origin, "kind": kind, **compact, "reload": True}, separators=(",", ":"))
+        if len(message.encode()) < MAX_PAYLOAD_BYTES:
+            log.debug(f"Invalidation event {kind} too large, sending reload marker")
+            return message
+
+        log.warning(f"Invalidation event {kind} too large, broadcasting resync")
+        return json.dumps({"origin": self.origin, "kind": RESYNC}, separators=(",", ":"))
+
+    async def publish(self, kind: str, **payload: Any) -> None:
+        """广播事件（随写操作在连接池连接上执行，失败只记录日志）"""
+        message = self._encode(kind, payload)
+        try:
+            if self.dao.in_transaction():
+                # 在保存点中执行，广播失败不会中止调用方的事务（NOTIFY 在事务提交时才送达）
+                async with self.dao.transaction() as conn:
+                    await conn.execute("SELECT pg_notify($1, $2)", self.channel, message)
+            else:
+                await self.dao.execute("SELECT pg_notify($1, $2)", self.channel, message)
+            self._published += 1
+        except Exception as e:
+            log.error(f"Failed to publish invalidation event {kind}: {e}")
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            log.warning(f"Malformed invalidation event: {payload[:100]}")
+            return
+
+        if event.get("origin") == self.origin:
+            return
+
+        self._received += 1
+        self._dispatch(event.get("kind"), event)
+
+    def _dispatch(self, kind: str, event: Dict[str, Any]) -> None:
+        for handler in self._handlers.get(kind, []):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(self._run_handler(kind, result))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            except Exception as e:
+                log.error(f"Invalidation handler for {kind} failed: {e}")
+
+    @staticmethod
+    async def _run_handler(kind: str, result: Awaitable[None]) -> None:
+        """执行异步处理器，异常与同步处理器一样记录日志"""
+        try:
+            await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Invalidation handler for {kind} failed: {e}")
+
+    def _on_terminated(self, connection) -> None:
+        if self._closing:
+            return
+        log.warning("Invalidation bus connection lost, reconnecting")
+        self._conn = None
+        self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._closing:
+            await asyncio.sleep(self.reconnect_delay_seconds)
+            try:
+                await self.start()
+            except Exception as e:
+                log.warning(f"Invalidation bus reconnect failed: {e}")
+                continue
+            # 断线期间的事件已丢失，重建本地缓存
+            self._dispatch(RESYNC, {"kind": RESYNC})
+            return
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "channel": self.channel,
+            "connected": self._conn is not None and not self._conn.is_closed(),
+            "published": self._published,
+            "received": self._received,
+            "pending_handlers": len(self._tasks),
+        }
+
+
+_invalidation_bus: Optional[InvalidationBus] = None
+
+
+def get_invalidation_bus() -> Optional[InvalidationBus]:
+    """获取失效总线（未启动时为None，单进程部署无需广播）"""
+    return _invalidation_bus
+
+
+def set_invalidation_bus(bus: Optional[InvalidationBus]) -> None:
+    """设置失效总线"""
+    global _invalidation_bus
+    _invalidation_bus = bus
+
+
+async def publish_invalidation(kind: str, **payload: Any) -> None:
+    """广播失效事件，总线未启动时不做任何事"""
+    if _invalidation_bus is not None:
+        await _invalidation_bus.publish(kind, **payload)
@@ -0,0 +1,100 @@
+"""
+认证服务 - 菜单树缓存
+
+数据库权限模式下，用户菜单只取决于其有效权限集合，而大量用户的权限集合完全相同。
+这里按权限集合指纹缓存过滤后的菜单树及其序列化结果（LRU），同时限制条目数和估算的内存占用，
+成千上万的用户只共享少数几棵计算好的菜单树。菜单配置变更时整体清空。
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from saturn_mousehunter_shared.log.logger import get_logger
+from infrastructure.config.app_config import MenuCacheConfig, get_menu_cache_config
+
+log = get_logger(__name__)
+
+
+class MenuTreeCache:
+    """权限集合指纹 -> 已渲染菜单树 的 LRU 缓存"""
+
+    def __init__(self, config: MenuCacheConfig):
+        self.max_entries = config.max_entries
+        self.max_bytes = config.max_bytes
+        self._entries: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, fingerprint: str) -> Optional[Any]:
+        """获取缓存的菜单树，未命中返回None"""
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(fingerprint)
+        self._hits += 1
+        return entry[1]
+
+    def put(self, fingerprint: str, value: Any, size: int) -> None:
+        """写入缓存，size 为条目的估算字节数"""
+        if not self.enabled or size > self.max_bytes:
+            return
+
+        self._remove(fingerprint)
+        self._entries[fingerprint] = (size, value)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove(self, fingerprint: str) -> None:
+        entry = self._entries.pop(fingerprint, None)
+        if entry is not None:
+            self._bytes -= entry[0]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 进程级共享实例，由 main.py 在 lifespan 中创建
+_menu_tree_cache: Optional[MenuTreeCache] = None
+
+
+def get_menu_tree_cache() -> MenuTreeCache:
+    """获取共享的菜单树缓存（未初始化时按环境变量配置创建）"""
+    global _menu_tree_cache
+    if _menu_tree_cache is None:
+        _menu_tree_cache = MenuTreeCache(get_menu_cache_config())
+    return _menu_tree_cache
+
+
+def set_menu_tree_cache(menu_tree_cache: Optional[MenuTreeCache]) -> None:
+    """设置共享的菜单树缓存"""
+    global _menu_tree_cache
+    _menu_tree_cache = menu_tree_cache
@@ -0,0 +1,190 @@
+"""
+认证服务 - 用户有效权限缓存
+
+get_user_permissions 需要四表连接，登录和菜单校验都会调用。这里按 (user_id, user_type)
+缓存计算结果（TTL + LRU），并按角色编码、权限编码建立反向索引，写操作只失效受影响的用户。
+每次失效都会递增代数，读库前记录代数，写回时代数已变化则丢弃，避免慢查询把撤销前的权限写回缓存。
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from saturn_mousehunter_shared.log.logger import get_logger
+from infrastructure.config.app_config import PermissionCacheConfig, get_permission_cache_config
+from domain.models.auth_user_role import UserPermissions, UserType
+
+log = get_logger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+class PermissionCache:
+    """用户有效权限的 TTL + LRU 缓存"""
+
+    def __init__(self, config: PermissionCacheConfig):
+        self.max_size = config.max_size
+        self.ttl_seconds = config.ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, UserPermissions]]" = OrderedDict()
+        self._by_role: Dict[str, Set[CacheKey]] = {}
+        self._by_permission: Dict[str, Set[CacheKey]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._generation = 0
+        self._stale_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def _key(user_id: str, user_type: UserType) -> CacheKey:
+        return user_id, user_type.value if isinstance(user_type, UserType) else str(user_type)
+
+    def get(self, user_id: str, user_type: UserType) -> Optional[UserPermissions]:
+        """获取缓存的用户权限，过期或未命中返回None（返回值只读）"""
+        key = self._key(user_id, user_type)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    @property
+    def generation(self) -> int:
+        """失效代数，读库前记录，写回时传给 put"""
+        return self._generation
+
+    def put(self, value: UserPermissions, expires_at: Optional[datetime] = None,
+            generation: Optional[int] = None) -> None:
+        """写入缓存，expires_at 为最早到期的角色分配时间；读库期间发生过失效则丢弃"""
+        if not self.enabled:
+            return
+        if generation is not None and generation != self._generation:
+            self._stale_puts += 1
+            return
+
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, (expires_at - datetime.now(expires_at.tzinfo)).total_seconds())
+            if ttl <= 0:
+                return
+
+        key = self._key(value.user_id, value.user_type)
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        for role_code in value.roles:
+            self._by_role.setdefault(role_code, set()).add(key)
+        for permission_code in value.permissions:
+            self._by_permission.setdefault(permission_code, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: CacheKey) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        value = entry[1]
+        for role_code in value.roles:
+            self._discard(self._by_role, role_code, key)
+        for permission_code in value.permissions:
+            self._discard(self._by_permission, permission_code, key)
+        return True
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[CacheKey]], code: str, key: CacheKey) -> None:
+        keys = index.get(code)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[code]
+
+    def _invalidate_keys(self, keys: Iterable[CacheKey]) -> int:
+        # 即使没有命中的条目也要递增，正在读库的填充可能属于被失效的用户
+        self._generation += 1
+        count = sum(1 for key in list(keys) if self._remove(key))
+        self._invalidations += count
+        return count
+
+    def invalidate_user(self, user_id: str, user_type: Optional[UserType] = None) -> int:
+        """失效单个用户（未指定类型时失效该ID的所有类型）"""
+        if user_type is not None:
+            keys = [self._key(user_id, user_type)]
+        else:
+            keys = [key for key in self._entries if key[0] == user_id]
+        return self._invalidate_keys(keys)
+
+    def invalidate_roles(self, role_codes: Iterable[str]) -> int:
+        """失效持有这些角色的用户"""
+        keys = set()
+        for role_code in role_codes:
+            keys |= self._by_role.get(role_code, set())
+        count = self._invalidate_keys(keys)
+        if count:
+            log.debug(f"Permission cache invalidated {count} users for roles: {list(role_codes)}")
+        return count
+
+    def invalidate_permissions(self, permission_codes: Iterable[str]) -> int:
+        """失效拥有这些权限的用户"""
+        keys = set()
+        for permission_code in permission_codes:
+            keys |= self._by_permission.get(permission_code, set())
+        count = self._invalidate_keys(keys)
+        if count:
+            log.debug(f"Permission cache invalidated {count} users for permissions: {list(permission_codes)}")
+        return count
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._generation += 1
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_role.clear()
+        self._by_permission.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "stale_puts": self._stale_puts,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 进程级共享实例，由 main.py 在 lifespan 中创建
+_permission_cache: Optional[PermissionCache] = None
+
+
+def get_permission_cache() -> PermissionCache:
+    """获取共享的权限缓存（未初始化时按环境变量配置创建）"""
+    global _permission_cache
+    if _permission_cache is None:
+        _permission_cache = PermissionCache(get_permission_cache_config())
+    return _permission_cache
+
+
+def set_permission_cache(permission_cache: Optional[PermissionCache]) -> None:
+    """设置共享的权限缓存"""
+    global _permission_cache
+    _permission_cache = permission_cache
@@ -0,0 +1,91 @@
+"""
+认证服务 - RBAC 缓存失效事件
+
+定义各 Repository 广播的事件类型，并把其他 worker 发来的事件应用到本进程的
+权限缓存和角色权限投影上。
+"""
+from typing import Any, Dict
+
+from saturn_mousehunter_shared.log.logger import get_logger
+from infrastructure.db.base_dao import AsyncDAO
+from domain.models.auth_user_role import UserType
+from .invalidation_bus import InvalidationBus, RESYNC
+from .permission_cache import get_permission_cache
+from .role_permission_projection import get_role_permission_projection
+
+log = get_logger(__name__)
+
+# 事件类型
+USER_ROLES_CHANGED = "user_roles"              # user_id, user_type
+ROLE_CHANGED = "role"                          # role_id, role_code, is_active, parent_role_id, previous_code
+PERMISSION_CHANGED = "permission"              # permission_id, permission_code(删除时为None), previous_code
+ROLE_PERMISSIONS_CHANGED = "role_permissions"  # role_id, granted{permission_id: code}, revoked[], replace, reload
+MENUS_CHANGED = "menus"                        # menu_id(批量操作时为None)
+
+
+def register_rbac_handlers(bus: InvalidationBus, dao: AsyncDAO) -> None:
+    """订阅RBAC相关事件"""
+
+    def on_user_roles(event: Dict[str, Any]) -> None:
+        user_type = event.get("user_type")
+        get_permission_cache().invalidate_user(event["user_id"], UserType(user_type) if user_type else None)
+
+    def on_role(event: Dict[str, Any]) -> None:
+        projection = get_role_permission_projection()
+        was_active = projection.is_active(event["role_id"])
+        projection.upsert_role(event["role_id"], event["role_code"], event["is_active"], event.get("parent_role_id"))
+        if event["is_active"] and not was_active:
+            # 重新启用的角色不在任何用户的有效角色中，无法按编码定位
+            get_permission_cache().clear()
+        else:
+            codes = {event["role_code"], event.get("previous_code")} - {None}
+            get_permission_cache().invalidate_roles(codes)
+
+    def on_permission(event: Dict[str, Any]) -> None:
+        projection = get_role_permission_projection()
+        if event.get("permission_code") is None:
+            projection.remove_permission(event["permission_id"])
+        else:
+            projection.upsert_permission(event["permission_id"], event["permission_code"])
+        codes = {event.get("permission_code"), event.get("previous_code")} - {None}
+        get_permission_cache().invalidate_permissions(codes)
+
+    async def reload_role_permissions(role_id: str) -> None:
+        projection = get_role_permission_projection()
+        await projection.reload_role(dao, role_id)
+        role_code = projection.role_code(role_id)
+        if role_code:
+            get_permission_cache().invalidate_roles([role_code])
+        else:
+            get_permission_cache().clear()
+
+    def on_role_permissions(event: Dict[str, Any]):
+        projection = get_role_permission_projection()
+        role_id = event["role_id"]
+        if event.get("reload"):
+            # 授权变更过多，事件中没有明细，从数据库重新加载该角色
+            return reload_role_permissions(role_id)
+        if event.get("replace"):
+            projection.clear_grants(role_id)
+        projection.remove_grants(role_id, event.get("revoked", []))
+        for permission_id, permission_code in event.get("granted", {}).items():
+            projection.add_grant(role_id, permission_id, permission_code)
+
+        role_code = projection.role_code(role_id)
+        if role_code:
+            get_permission_cache().invalidate_roles([role_code])
+        else:
+            get_permission_cache().clear()
+
+    async def on_resync(event: Dict[str, Any]) -> None:
+        get_permission_cache().clear()
+        try:
+            await get_role_permission_projection().load(dao)
+        except Exception as e:
+            log.error(f"Role permission projection resync failed: {e}")
+
+    bus.subscribe(USER_ROLES_CHANGED, on_user_roles)
+    bus.subscribe(ROLE_CHANGED, on_role)
+    bus.subscribe(PERMISSION_CHANGED, on_permission)
+    bus.subscribe(ROLE_PERMISSIONS_CHANGED, on_role_permissions)
+    bus.subscribe(RESYNC, on_resync)
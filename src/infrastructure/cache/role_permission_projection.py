@@ -0,0 +1,255 @@
+"""
+认证服务 - 角色权限投影
+
+在内存中维护 角色 -> 权限编码 的映射，启动时全量加载一次，之后由角色、权限、角色权限
+Repository 的写操作增量更新。用户有效权限只需查询其角色ID，再合并几个角色的权限集合。
+角色沿 parent_role_id 继承祖先的权限，传递闭包在变更后首次解析时整体重建一次并缓存，
+解析时与继承深度无关。
+"""
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from saturn_mousehunter_shared.log.logger import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass
+class ProjectedRole:
+    """投影中的角色"""
+    role_code: str
+    is_active: bool
+    parent_id: Optional[str] = None
+    permissions: Dict[str, str] = field(default_factory=dict)  # permission_id -> permission_code
+
+
+class RolePermissionProjection:
+    """角色权限内存投影"""
+
+    def __init__(self):
+        self.loaded = False
+        self._dao = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self._roles: Dict[str, ProjectedRole] = {}
+        self._permission_codes: Dict[str, str] = {}  # permission_id -> permission_code
+        self._generation = 0  # 增量变更计数，加载期间有变更时快照可能已过时
+        # role_id -> (有效权限编码, 有效角色编码)，None 表示需要重建
+        self._closure: Optional[Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]] = None
+
+    async def load(self, dao, max_attempts: int = 3) -> None:
+        """从数据库全量加载；加载期间收到增量变更时重新加载，避免快照覆盖掉该变更"""
+        for attempt in range(max_attempts):
+            generation = self._generation
+            role_rows = await dao.fetch_all("SELECT id, role_code, is_active, parent_role_id FROM mh_auth_roles")
+            permission_rows = await dao.fetch_all("SELECT id, permission_code FROM mh_auth_permissions")
+            grant_rows = await dao.fetch_all("SELECT role_id, permission_id FROM mh_auth_role_permissions")
+            if generation == self._generation:
+                break
+            log.info(f"Role permission projection changed during load, retrying ({attempt + 1}/{max_attempts})")
+
+        roles = {
+            row['id']: ProjectedRole(row['role_code'], row['is_active'], row['parent_role_id'])
+            for row in role_rows
+        }
+        permission_codes = {row['id']: row['permission_code'] for row in permission_rows}
+        for row in grant_rows:
+            role = roles.get(row['role_id'])
+            code = permission_codes.get(row['permission_id'])
+            if role is not None and code is not None:
+                role.permissions[row['permission_id']] = code
+
+        self._roles = roles
+        self._permission_codes = permission_codes
+        self._closure = None
+        self._dao = dao
+        self.loaded = True
+        log.info(f"Role permission projection loaded: roles={len(roles)}, grants={len(grant_rows)}")
+
+    def _build_closure(self) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """沿父角色链计算每个角色的有效权限和有效角色"""
+        closure = {}
+        for role_id in self._roles:
+            permissions = set()
+            roles = set()
+            visited = set()
+            current_id: Optional[str] = role_id
+            # 停用的角色不授予权限，也不再向上继承；visited 防止并发写入造成的环
+            while current_id is not None and current_id not in visited:
+                visited.add(current_id)
+                role = self._roles.get(current_id)
+                if role is None or not role.is_active:
+                    break
+                roles.add(role.role_code)
+                permissions.update(role.permissions.values())
+                current_id = role.parent_id
+            closure[role_id] = (frozenset(permissions), frozenset(roles))
+
+        log.debug(f"Role closure rebuilt: roles={len(closure)}")
+        return closure
+
+    def _changed(self) -> None:
+        self._closure = None
+        self._generation += 1
+
+    def _schedule_reload(self) -> None:
+        """投影与数据库不一致：后台重新全量加载，期间查询回退到SQL"""
+        if self._dao is None or (self._reload_task is not None and not self._reload_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # 使用空上下文，避免重载沿用调用方事务绑定的连接
+        self._reload_task = loop.create_task(self._reload(), context=contextvars.Context())
+
+    async def _reload(self) -> None:
+        try:
+            await self.load(self._dao)
+        except Exception as e:
+            log.error(f"Role permission projection reload failed: {e}")
+
+    def resolve(self, role_ids: Iterable[str]) -> Optional[Tuple[List[str], List[str]]]:
+        """合并角色（含继承）权限，返回 (权限编码, 角色编码)；存在未知角色时返回None由调用方回退到SQL"""
+        if not self.loaded:
+            return None
+
+        closure = self._closure
+        if closure is None:
+            closure = self._closure = self._build_closure()
+
+        permissions = set()
+        roles = set()
+        for role_id in role_ids:
+            entry = closure.get(role_id)
+            if entry is None:
+                return None
+            permissions.update(entry[0])
+            roles.update(entry[1])
+
+        return sorted(permissions), sorted(roles)
+
+    def role_code(self, role_id: str) -> Optional[str]:
+        role = self._roles.get(role_id)
+        return role.role_code if role else None
+
+    def permission_code(self, permission_id: str) -> Optional[str]:
+        return self._permission_codes.get(permission_id)
+
+    # ---- 增量更新 ----
+
+    def is_active(self, role_id: str) -> Optional[bool]:
+        role = self._roles.get(role_id)
+        return role.is_active if role else None
+
+    def upsert_role(self, role_id: str, role_code: str, is_active: bool, parent_id: Optional[str] = None) -> None:
+        role = self._roles.get(role_id)
+        if role is None:
+            self._roles[role_id] = ProjectedRole(role_code, is_active, parent_id)
+        else:
+            role.role_code = role_code
+            role.is_active = is_active
+            role.parent_id = parent_id
+        self._changed()
+
+    def set_role_active(self, role_id: str, is_active: bool) -> None:
+        role = self._roles.get(role_id)
+        if role is not None:
+            role.is_active = is_active
+        self._changed()
+
+    def upsert_permission(self, permission_id: str, permission_code: str) -> None:
+        self._permission_codes[permission_id] = permission_code
+        for role in self._roles.values():
+            if permission_id in role.permissions:
+                role.permissions[permission_id] = permission_code
+        self._changed()
+
+    def remove_permission(self, permission_id: str) -> None:
+        self._permission_codes.pop(permission_id, None)
+        for role in self._roles.values():
+            role.permissions.pop(permission_id, None)
+        self._changed()
+
+    def add_grant(self, role_id: str, permission_id: str, permission_code: Optional[str] = None) -> None:
+        role = self._roles.get(role_id)
+        code = permission_code or self._permission_codes.get(permission_id)
+        if role is None or code is None:
+            # 投影缺少该角色或权限，放弃增量更新，重载完成前查询回退到SQL
+            self.loaded = False
+            log.warning(f"Role permission projection out of sync: role={role_id}, permission={permission_id}")
+            self._changed()
+            self._schedule_reload()
+            return
+        role.permissions[permission_id] = code
+        self._changed()
+
+    async def reload_role(self, dao, role_id: str) -> None:
+        """从数据库重新加载单个角色的权限（事件负载过大时只带角色ID）"""
+        role = self._roles.get(role_id)
+        if role is None:
+            self.loaded = False
+            self._schedule_reload()
+            return
+
+        try:
+            rows = await dao.fetch_all(
+                """
+                SELECT rp.permission_id, p.permission_code
+                FROM mh_auth_role_permissions rp
+                JOIN mh_auth_permissions p ON p.id = rp.permission_id
+                WHERE rp.role_id = $1
+                """,
+                role_id
+            )
+        except Exception as e:
+            log.error(f"Role permission reload failed for {role_id}: {e}")
+            self.loaded = False
+            self._schedule_reload()
+            return
+
+        role.permissions = {row['permission_id']: row['permission_code'] for row in rows}
+        for row in rows:
+            self._permission_codes[row['permission_id']] = row['permission_code']
+        self._changed()
+
+    def remove_grants(self, role_id: str, permission_ids: Iterable[str]) -> None:
+        role = self._roles.get(role_id)
+        if role is not None:
+            for permission_id in permission_ids:
+                role.permissions.pop(permission_id, None)
+        self._changed()
+
+    def clear_grants(self, role_id: str) -> None:
+        role = self._roles.get(role_id)
+        if role is not None:
+            role.permissions.clear()
+        self._changed()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "roles": len(self._roles),
+            "grants": sum(len(role.permissions) for role in self._roles.values()),
+            "inherited_roles": sum(1 for role in self._roles.values() if role.parent_id),
+            "closure_built": self._closure is not None,
+            "reloading": self._reload_task is not None and not self._reload_task.done(),
+        }
+
+
+_role_permission_projection: Optional[RolePermissionProjection] = None
+
+
+def get_role_permission_projection() -> RolePermissionProjection:
+    """获取共享的角色权限投影（未加载时各查询回退到SQL）"""
+    global _role_permission_projection
+    if _role_permission_projection is None:
+        _role_permission_projection = RolePermissionProjection()
+    return _role_permission_projection
+
+
+def set_role_permission_projection(projection: Optional[RolePermissionProjection]) -> None:
+    """设置共享的角色权限投影"""
+    global _role_permission_projection
+    _role_permission_projection = projection
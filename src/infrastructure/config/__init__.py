@@ -4,8 +4,10 @@
 
 from .database import DatabaseConfig, get_database_config, get_test_database_config
 from .app_config import (
-    AppConfig, JWTConfig, CORSConfig, SecurityConfig,
-    get_app_config, get_jwt_config, get_cors_config, get_security_config
+    AppConfig, JWTConfig, JWTKey, CORSConfig, SecurityConfig, PasswordHashingConfig,
+    PermissionCacheConfig, MenuCacheConfig,
+    get_app_config, get_jwt_config, get_cors_config, get_security_config,
+    get_password_hashing_config, get_permission_cache_config, get_menu_cache_config
 )
 
 __all__ = [
@@ -13,6 +15,8 @@ __all__ = [
     "DatabaseConfig", "get_database_config", "get_test_database_config",
 
     # App Config
-    "AppConfig", "JWTConfig", "CORSConfig", "SecurityConfig",
-    "get_app_config", "get_jwt_config", "get_cors_config", "get_security_config"
+    "AppConfig", "JWTConfig", "JWTKey", "CORSConfig", "SecurityConfig", "PasswordHashingConfig",
+    "PermissionCacheConfig", "MenuCacheConfig",
+    "get_app_config", "get_jwt_config", "get_cors_config", "get_security_config",
+    "get_password_hashing_config", "get_permission_cache_config", "get_menu_cache_config"
 ]
\ No newline at end of file
@@ -2,13 +2,43 @@
 认证服务 - 应用配置
 """
 import os
-from typing import List
-from dataclasses import dataclass
+import json
+from typing import List, Optional
+from dataclasses import dataclass, field
 from saturn_mousehunter_shared.log.logger import get_logger
 
 log = get_logger(__name__)
 
 
+# 支持的非对称签名算法（下游服务可通过JWKS离线验签）
+ASYMMETRIC_JWT_ALGORITHMS = (
+    "RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512", "EdDSA"
+)
+
+
+@dataclass
+class JWTKey:
+    """JWT密钥环中的单个密钥"""
+    algorithm: str
+    kid: Optional[str] = None          # 未配置时自动生成
+    secret_key: Optional[str] = None   # HS* 算法共享密钥
+    private_key: Optional[str] = None  # 非对称算法私钥（PEM）
+    public_key: Optional[str] = None   # 非对称算法公钥（PEM），只有公钥时仅用于验签
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_JWT_ALGORITHMS
+
+    def __post_init__(self):
+        if self.is_asymmetric:
+            if not self.private_key and not self.public_key:
+                raise ValueError(f"{self.algorithm} 算法必须配置私钥或公钥")
+        elif not self.algorithm.startswith("HS"):
+            raise ValueError(f"不支持的JWT算法: {self.algorithm}")
+        elif len(self.secret_key or "") < 32:
+            raise ValueError("JWT密钥长度不能少于32位")
+
+
 @dataclass
 class JWTConfig:
     """JWT配置"""
@@ -17,10 +47,33 @@ class JWTConfig:
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     issuer: str = "saturn-mousehunter-auth-service"
+    verify_cache_size: int = 10000  # 已验证令牌缓存条目数，0表示禁用
+    private_key: Optional[str] = None  # 非对称算法私钥（PEM）
+    public_key: Optional[str] = None   # 非对称算法公钥（PEM），未配置时由私钥推导
+    key_id: Optional[str] = None       # 令牌头中的 kid，未配置时自动生成
+    jwks_max_age_seconds: int = 300    # JWKS响应的缓存时间
+    previous_keys: List[JWTKey] = field(default_factory=list)  # 轮换后仍接受验签的旧密钥
+    compact_permissions: bool = False  # 访问令牌中的权限以字典位图编码
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_JWT_ALGORITHMS
+
+    @property
+    def signing_key(self) -> JWTKey:
+        """当前签名密钥"""
+        return JWTKey(
+            algorithm=self.algorithm,
+            kid=self.key_id,
+            secret_key=None if self.is_asymmetric else self.secret_key,
+            private_key=self.private_key,
+            public_key=self.public_key,
+        )
 
     def __post_init__(self):
-        if len(self.secret_key) < 32:
-            raise ValueError("JWT密钥长度不能少于32位")
+        # 复用 JWTKey 的校验逻辑；只有公钥的密钥只能用于验签，放在 previous_keys 中
+        if self.signing_key.is_asymmetric and not self.private_key:
+            raise ValueError(f"当前签名密钥必须配置私钥: AUTH_JWT_PRIVATE_KEY（{self.algorithm}）")
 
 
 @dataclass
@@ -52,6 +105,49 @@ class SecurityConfig:
     require_email_verification: bool = False
 
 
+@dataclass
+class PasswordHashingConfig:
+    """密码哈希线程池配置"""
+    executor: str = "thread"            # thread / process
+    max_workers: int = 4
+    max_pending: int = 64               # 排队+执行中的最大任务数
+    queue_timeout_seconds: float = 2.0  # 等待进入队列的最长时间
+
+    def __post_init__(self):
+        if self.executor not in ("thread", "process"):
+            raise ValueError("密码哈希执行器只支持 thread 或 process")
+        if self.max_workers < 1:
+            raise ValueError("密码哈希工作线程数至少为1")
+        if self.max_pending < self.max_workers:
+            raise ValueError("密码哈希队列深度不能小于工作线程数")
+
+
+@dataclass
+class PermissionCacheConfig:
+    """用户有效权限缓存配置"""
+    max_size: int = 10000       # 缓存的 (user_id, user_type) 数量，0表示禁用
+    ttl_seconds: float = 300.0  # 条目存活时间，写操作会精确失效
+
+    def __post_init__(self):
+        if self.max_size < 0:
+            raise ValueError("权限缓存容量不能为负数")
+        if self.ttl_seconds <= 0:
+            raise ValueError("权限缓存TTL必须大于0")
+
+
+@dataclass
+class MenuCacheConfig:
+    """按权限集合指纹缓存的菜单树配置"""
+    max_entries: int = 1024                # 缓存的不同权限集合数量，0表示禁用
+    max_bytes: int = 32 * 1024 * 1024      # 按序列化后的字节数估算的内存上限
+
+    def __post_init__(self):
+        if self.max_entries < 0:
+            raise ValueError("菜单缓存容量不能为负数")
+        if self.max_bytes <= 0:
+            raise ValueError("菜单缓存内存上限必须大于0")
+
+
 @dataclass
 class AppConfig:
     """应用配置"""
@@ -62,9 +158,13 @@ class AppConfig:
     port: int = 8001
     reload: bool = False
     log_level: str = "INFO"
+    invalidation_bus_enabled: bool = True  # 多 worker 间通过 LISTEN/NOTIFY 同步缓存失效
     jwt: JWTConfig = None
     cors: CORSConfig = None
     security: SecurityConfig = None
+    password_hashing: PasswordHashingConfig = None
+    permission_cache: PermissionCacheConfig = None
+    menu_cache: MenuCacheConfig = None
 
     def __post_init__(self):
         if self.jwt is None:
@@ -73,12 +173,45 @@ class AppConfig:
             self.cors = get_cors_config()
         if self.security is None:
             self.security = get_security_config()
+        if self.password_hashing is None:
+            self.password_hashing = get_password_hashing_config()
+        if self.permission_cache is None:
+            self.permission_cache = get_permission_cache_config()
+        if self.menu_cache is None:
+            self.menu_cache = get_menu_cache_config()
+
+
+def _read_pem_from_env(name: str) -> Optional[str]:
+    """读取PEM密钥：优先 NAME，其次 NAME_FILE 指向的文件"""
+    value = os.getenv(name)
+    if value:
+        return value.replace("\\n", "\n")
+
+    path = os.getenv(f"{name}_FILE")
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+def _read_previous_jwt_keys() -> List[JWTKey]:
+    """读取轮换后的旧密钥：AUTH_JWT_PREVIOUS_KEYS 或 AUTH_JWT_PREVIOUS_KEYS_FILE，内容为JSON数组"""
+    raw = os.getenv("AUTH_JWT_PREVIOUS_KEYS")
+    path = os.getenv("AUTH_JWT_PREVIOUS_KEYS_FILE")
+    if not raw and path:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.read()
+    if not raw:
+        return []
+
+    return [JWTKey(**item) for item in json.loads(raw)]
 
 
 def get_jwt_config() -> JWTConfig:
     """从环境变量获取JWT配置"""
-    secret_key = os.getenv("AUTH_JWT_SECRET_KEY")
-    if not secret_key:
+    algorithm = os.getenv("AUTH_JWT_ALGORITHM", "HS256")
+    secret_key = os.getenv("AUTH_JWT_SECRET_KEY", "")
+    if not secret_key and algorithm not in ASYMMETRIC_JWT_ALGORITHMS:
         # 开发环境使用默认密钥，生产环境必须配置
         if os.getenv("AUTH_ENV", "development") == "production":
             raise ValueError("生产环境必须配置 AUTH_JWT_SECRET_KEY")
@@ -87,10 +220,17 @@ def get_jwt_config() -> JWTConfig:
 
     return JWTConfig(
         secret_key=secret_key,
-        algorithm=os.getenv("AUTH_JWT_ALGORITHM", "HS256"),
+        algorithm=algorithm,
         access_token_expire_minutes=int(os.getenv("AUTH_JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
         refresh_token_expire_days=int(os.getenv("AUTH_JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7")),
         issuer=os.getenv("AUTH_JWT_ISSUER", "saturn-mousehunter-auth-service"),
+        verify_cache_size=int(os.getenv("AUTH_JWT_VERIFY_CACHE_SIZE", "10000")),
+        private_key=_read_pem_from_env("AUTH_JWT_PRIVATE_KEY"),
+        public_key=_read_pem_from_env("AUTH_JWT_PUBLIC_KEY"),
+        key_id=os.getenv("AUTH_JWT_KEY_ID") or None,
+        jwks_max_age_seconds=int(os.getenv("AUTH_JWT_JWKS_MAX_AGE_SECONDS", "300")),
+        previous_keys=_read_previous_jwt_keys(),
+        compact_permissions=os.getenv("AUTH_JWT_COMPACT_PERMISSIONS", "false").lower() == "true",
     )
 
 
@@ -120,6 +260,32 @@ def get_security_config() -> SecurityConfig:
     )
 
 
+def get_password_hashing_config() -> PasswordHashingConfig:
+    """从环境变量获取密码哈希线程池配置"""
+    return PasswordHashingConfig(
+        executor=os.getenv("AUTH_PASSWORD_HASH_EXECUTOR", "thread").lower(),
+        max_workers=int(os.getenv("AUTH_PASSWORD_HASH_WORKERS", "4")),
+        max_pending=int(os.getenv("AUTH_PASSWORD_HASH_MAX_PENDING", "64")),
+        queue_timeout_seconds=float(os.getenv("AUTH_PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "2.0")),
+    )
+
+
+def get_permission_cache_config() -> PermissionCacheConfig:
+    """从环境变量获取权限缓存配置"""
+    return PermissionCacheConfig(
+        max_size=int(os.getenv("AUTH_PERMISSION_CACHE_SIZE", "10000")),
+        ttl_seconds=float(os.getenv("AUTH_PERMISSION_CACHE_TTL_SECONDS", "300")),
+    )
+
+
+def get_menu_cache_config() -> MenuCacheConfig:
+    """从环境变量获取菜单树缓存配置"""
+    return MenuCacheConfig(
+        max_entries=int(os.getenv("AUTH_MENU_CACHE_SIZE", "1024")),
+        max_bytes=int(os.getenv("AUTH_MENU_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    )
+
+
 def get_app_config() -> AppConfig:
     """从环境变量获取应用配置"""
     return AppConfig(
@@ -130,4 +296,5 @@ def get_app_config() -> AppConfig:
         port=int(os.getenv("AUTH_PORT", "8001")),
         reload=os.getenv("AUTH_RELOAD", "false").lower() == "true",
         log_level=os.getenv("AUTH_LOG_LEVEL", "INFO"),
+        invalidation_bus_enabled=os.getenv("AUTH_CACHE_INVALIDATION_BUS", "true").lower() == "true",
     )
\ No newline at end of file
@@ -3,6 +3,7 @@
 """
 from typing import Any, List, Optional, Dict
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import asyncpg
 from saturn_mousehunter_shared.log.logger import get_logger
 from saturn_mousehunter_shared.aop.decorators import measure
@@ -18,6 +19,10 @@ class AsyncDAO:
         self.min_connections = min_connections
         self.max_connections = max_connections
         self.pool: Optional[asyncpg.Pool] = None
+        # 当前任务所在事务的连接，事务内的 fetch/execute 都复用它
+        self._tx_connection: ContextVar[Optional[asyncpg.Connection]] = ContextVar(
+            f"tx_connection_{id(self)}", default=None
+        )
 
     async def init_pool(self) -> None:
         """初始化连接池"""
@@ -43,7 +48,12 @@ class AsyncDAO:
 
     @asynccontextmanager
     async def get_connection(self):
-        """获取数据库连接"""
+        """获取数据库连接（处于事务中时返回事务连接）"""
+        tx_connection = self._tx_connection.get()
+        if tx_connection is not None:
+            yield tx_connection
+            return
+
         if not self.pool:
             await self.init_pool()
 
@@ -109,11 +119,21 @@ class AsyncDAO:
                 log.error(f"execute_many 执行失败: {e}, query: {query[:100]}...")
                 raise
 
+    def in_transaction(self) -> bool:
+        """当前上下文是否处于本DAO开启的事务中"""
+        return self._tx_connection.get() is not None
+
     @asynccontextmanager
     async def transaction(self):
-        """事务上下文管理器"""
+        """
+        事务上下文管理器
+
+        事务内通过本DAO执行的所有查询（包括Repository方法）都绑定到同一连接；
+        嵌套调用使用保存点。事务内不要并发执行查询，单个连接同一时刻只能执行一条语句。
+        """
         async with self.get_connection() as conn:
             transaction = conn.transaction()
+            token = self._tx_connection.set(conn)
             try:
                 await transaction.start()
                 yield conn
@@ -123,6 +143,8 @@ class AsyncDAO:
                 await transaction.rollback()
                 log.error(f"事务回滚: {e}")
                 raise
+            finally:
+                self._tx_connection.reset(token)
 
     async def health_check(self) -> bool:
         """健康检查"""
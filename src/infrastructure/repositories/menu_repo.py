@@ -7,6 +7,8 @@ from datetime import datetime
 
 from saturn_mousehunter_shared.log.logger import get_logger
 from infrastructure.db.base_dao import AsyncDAO
+from infrastructure.cache.invalidation_bus import publish_invalidation
+from infrastructure.cache.rbac_invalidation import MENUS_CHANGED
 from domain.models.auth_menu import MenuConfig, MenuType
 
 log = get_logger(__name__)
@@ -54,7 +56,7 @@ class MenuRepo:
         ]
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 await conn.execute(create_menu_table_sql)
                 for index_sql in create_indexes_sql:
                     await conn.execute(index_sql)
@@ -78,7 +80,7 @@ class MenuRepo:
         """
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 await conn.execute(
                     insert_sql,
                     menu_data.id, menu_data.name, menu_data.title, menu_data.title_en,
@@ -90,6 +92,7 @@ class MenuRepo:
                 )
 
                 log.info(f"Created menu: {menu_data.id} by user: {created_by}")
+                await publish_invalidation(MENUS_CHANGED, menu_id=menu_data.id)
                 return menu_data.id
 
         except Exception as e:
@@ -107,7 +110,7 @@ class MenuRepo:
         """
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 row = await conn.fetchrow(query_sql, menu_id)
 
                 if not row:
@@ -136,7 +139,7 @@ class MenuRepo:
         query_sql += " ORDER BY sort_order ASC, created_at ASC"
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 rows = await conn.fetch(query_sql, *params)
 
                 menus = []
@@ -184,7 +187,7 @@ class MenuRepo:
         """
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 result = await conn.execute(update_sql, *params)
 
                 rows_affected = int(result.split()[-1]) if result else 0
@@ -192,6 +195,7 @@ class MenuRepo:
 
                 if success:
                     log.info(f"Updated menu: {menu_id} by user: {updated_by}")
+                    await publish_invalidation(MENUS_CHANGED, menu_id=menu_id)
                 else:
                     log.warning(f"No rows affected when updating menu: {menu_id}")
 
@@ -210,7 +214,7 @@ class MenuRepo:
         """
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 result = await conn.execute(update_sql, deleted_by, datetime.now(), menu_id)
 
                 rows_affected = int(result.split()[-1]) if result else 0
@@ -218,6 +222,7 @@ class MenuRepo:
 
                 if success:
                     log.info(f"Deleted menu: {menu_id} by user: {deleted_by}")
+                    await publish_invalidation(MENUS_CHANGED, menu_id=menu_id)
                 else:
                     log.warning(f"No rows affected when deleting menu: {menu_id}")
 
@@ -242,7 +247,7 @@ class MenuRepo:
 
         created_count = 0
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 async with conn.transaction():
                     for menu in menus:
                         try:
@@ -261,6 +266,8 @@ class MenuRepo:
                             # 继续处理其他菜单
 
                 log.info(f"Batch created {created_count}/{len(menus)} menus by user: {created_by}")
+                if created_count:
+                    await publish_invalidation(MENUS_CHANGED, menu_id=None)
                 return created_count
 
         except Exception as e:
@@ -276,12 +283,14 @@ class MenuRepo:
         """
 
         try:
-            async with self.dao.acquire() as conn:
+            async with self.dao.get_connection() as conn:
                 result = await conn.execute(update_sql, deleted_by, datetime.now())
 
                 rows_affected = int(result.split()[-1]) if result else 0
 
                 log.info(f"Cleared {rows_affected} menus by user: {deleted_by}")
+                if rows_affected:
+                    await publish_invalidation(MENUS_CHANGED, menu_id=None)
                 return rows_affected
 
         except Exception as e:
@@ -8,6 +8,9 @@ from saturn_mousehunter_shared.foundation.ids import make_ulid
 from saturn_mousehunter_shared.aop.decorators import measure, read_only_guard
 from saturn_mousehunter_shared.log.logger import get_logger
 from infrastructure.db.base_dao import AsyncDAO
+from infrastructure.cache.role_permission_projection import RolePermissionProjection, get_role_permission_projection
+from infrastructure.cache.invalidation_bus import publish_invalidation
+from infrastructure.cache.rbac_invalidation import PERMISSION_CHANGED
 from domain.models.auth_permission import PermissionIn, PermissionOut, PermissionUpdate, PermissionQuery
 
 log = get_logger(__name__)
@@ -18,8 +21,9 @@ TABLE = "mh_auth_permissions"
 class PermissionRepo:
     """权限Repository"""
 
-    def __init__(self, dao: AsyncDAO):
+    def __init__(self, dao: AsyncDAO, projection: Optional[RolePermissionProjection] = None):
         self.dao = dao
+        self.projection = projection if projection is not None else get_role_permission_projection()
 
     @measure("db_permission_create_seconds")
     async def create(self, permission_data: PermissionIn) -> PermissionOut:
@@ -49,6 +53,8 @@ class PermissionRepo:
             now
         )
 
+        self.projection.upsert_permission(row['id'], row['permission_code'])
+        await publish_invalidation(PERMISSION_CHANGED, permission_id=row['id'], permission_code=row['permission_code'])
         log.info(f"Created permission: {permission_data.permission_code}")
         return PermissionOut.from_dict(dict(row))
 
@@ -114,6 +120,11 @@ class PermissionRepo:
 
         row = await self.dao.fetch_one(query, *params)
         if row:
+            self.projection.upsert_permission(row['id'], row['permission_code'])
+            await publish_invalidation(
+                PERMISSION_CHANGED, permission_id=row['id'], permission_code=row['permission_code'],
+                previous_code=permission.permission_code if permission else None
+            )
             log.info(f"Updated permission: {permission_id}")
             return PermissionOut.from_dict(dict(row))
         return permission  # 返回原权限（系统权限不可修改）
@@ -144,6 +155,11 @@ class PermissionRepo:
         success = result > 0
 
         if success:
+            self.projection.remove_permission(permission_id)
+            await publish_invalidation(
+                PERMISSION_CHANGED, permission_id=permission_id, permission_code=None,
+                previous_code=permission.permission_code if permission else None
+            )
             log.info(f"Deleted permission: {permission_id}")
 
         return success
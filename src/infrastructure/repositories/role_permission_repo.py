@@ -8,6 +8,10 @@ from saturn_mousehunter_shared.foundation.ids import make_ulid
 from saturn_mousehunter_shared.aop.decorators import measure, read_only_guard
 from saturn_mousehunter_shared.log.logger import get_logger
 from infrastructure.db.base_dao import AsyncDAO
+from infrastructure.cache.permission_cache import PermissionCache, get_permission_cache
+from infrastructure.cache.role_permission_projection import RolePermissionProjection, get_role_permission_projection
+from infrastructure.cache.invalidation_bus import publish_invalidation
+from infrastructure.cache.rbac_invalidation import ROLE_PERMISSIONS_CHANGED
 from domain.models.auth_role_permission import (
     RolePermissionIn, RolePermissionOut, RolePermissionQuery,
     RolePermissionAssignment
@@ -21,8 +25,21 @@ TABLE = "mh_auth_role_permissions"
 class RolePermissionRepo:
     """角色权限关系Repository"""
 
-    def __init__(self, dao: AsyncDAO):
+    def __init__(self, dao: AsyncDAO,
+                 projection: Optional[RolePermissionProjection] = None,
+                 permission_cache: Optional[PermissionCache] = None):
         self.dao = dao
+        self.projection = projection if projection is not None else get_role_permission_projection()
+        self.permission_cache = permission_cache if permission_cache is not None else get_permission_cache()
+
+    def _role_changed(self, role_id: str, role_code: Optional[str] = None) -> None:
+        """角色的权限集合变化后，失效持有该角色的用户"""
+        role_code = role_code or self.projection.role_code(role_id)
+        if role_code:
+            self.permission_cache.invalidate_roles([role_code])
+        else:
+            # 无法定位角色编码时保守地清空
+            self.permission_cache.clear()
 
     @measure("db_role_permission_create_seconds")
     async def create(self, role_permission_data: RolePermissionIn) -> RolePermissionOut:
@@ -31,11 +48,17 @@ class RolePermissionRepo:
         now = datetime.now()
 
         query = f"""
-        INSERT INTO {TABLE} (
-            id, role_id, permission_id, created_at
-        ) VALUES (
-            $1, $2, $3, $4
-        ) RETURNING *
+        WITH ins AS (
+            INSERT INTO {TABLE} (
+                id, role_id, permission_id, created_at
+            ) VALUES (
+                $1, $2, $3, $4
+            ) RETURNING *
+        )
+        SELECT ins.*, r.role_name, r.role_code, p.permission_name, p.permission_code
+        FROM ins
+        LEFT JOIN mh_auth_roles r ON ins.role_id = r.id
+        LEFT JOIN mh_auth_permissions p ON ins.permission_id = p.id
         """
 
         row = await self.dao.fetch_one(
@@ -45,16 +68,16 @@ class RolePermissionRepo:
             role_permission_data.permission_id,
             now
         )
-
-        # 获取详细信息
         role_permission = RolePermissionOut.from_dict(dict(row))
-        details = await self._get_role_permission_details(role_permission.role_id, role_permission.permission_id)
-        if details:
-            role_permission.role_name = details.get('role_name')
-            role_permission.role_code = details.get('role_code')
-            role_permission.permission_name = details.get('permission_name')
-            role_permission.permission_code = details.get('permission_code')
 
+        self.projection.add_grant(
+            role_permission.role_id, role_permission.permission_id, role_permission.permission_code
+        )
+        self._role_changed(role_permission.role_id, role_permission.role_code)
+        await publish_invalidation(
+            ROLE_PERMISSIONS_CHANGED, role_id=role_permission.role_id,
+            granted={role_permission.permission_id: role_permission.permission_code}
+        )
         log.info(f"Created role permission: role={role_permission_data.role_id}, permission={role_permission_data.permission_id}")
         return role_permission
 
@@ -78,11 +101,16 @@ class RolePermissionRepo:
     @measure("db_role_permission_delete_seconds")
     async def delete(self, role_permission_id: str) -> bool:
         """删除角色权限关系"""
-        query = f"DELETE FROM {TABLE} WHERE id = $1"
-        result = await self.dao.execute(query, role_permission_id)
-        success = result > 0
+        query = f"DELETE FROM {TABLE} WHERE id = $1 RETURNING role_id, permission_id"
+        row = await self.dao.fetch_one(query, role_permission_id)
+        success = row is not None
 
         if success:
+            self.projection.remove_grants(row['role_id'], [row['permission_id']])
+            self._role_changed(row['role_id'])
+            await publish_invalidation(
+                ROLE_PERMISSIONS_CHANGED, role_id=row['role_id'], revoked=[row['permission_id']]
+            )
             log.info(f"Deleted role permission: {role_permission_id}")
 
         return success
@@ -161,26 +189,51 @@ class RolePermissionRepo:
         rows = await self.dao.fetch_all(query, permission_id)
         return [RolePermissionOut.from_dict(dict(row)) for row in rows]
 
+    @measure("db_role_permission_insert_grants_seconds")
+    async def _insert_grants(self, role_id: str, permission_ids: List[str]) -> List[RolePermissionOut]:
+        """批量插入角色权限并带回名称/编码，已存在的关系跳过"""
+        permission_ids = list(dict.fromkeys(permission_ids))
+        if not permission_ids:
+            return []
+
+        query = f"""
+        WITH ins AS (
+            INSERT INTO {TABLE} (id, role_id, permission_id, created_at)
+            SELECT t.id, $3::varchar, t.permission_id, $4::timestamptz
+            FROM unnest($1::varchar[], $2::varchar[]) AS t(id, permission_id)
+            ON CONFLICT (role_id, permission_id) DO NOTHING
+            RETURNING *
+        )
+        SELECT ins.*, r.role_name, r.role_code, p.permission_name, p.permission_code
+        FROM ins
+        LEFT JOIN mh_auth_roles r ON ins.role_id = r.id
+        LEFT JOIN mh_auth_permissions p ON ins.permission_id = p.id
+        """
+
+        rows = await self.dao.fetch_all(
+            query,
+            [make_ulid() for _ in permission_ids],
+            permission_ids,
+            role_id,
+            datetime.now()
+        )
+        return [RolePermissionOut.from_dict(dict(row)) for row in rows]
+
     @measure("db_role_permission_assign_permissions_seconds")
     async def assign_permissions(self, assignment: RolePermissionAssignment) -> List[RolePermissionOut]:
-        """批量分配权限给角色"""
-        role_permissions = []
-
-        async with self.dao.transaction():
-            for permission_id in assignment.permission_ids:
-                # 检查是否已存在
-                existing = await self._check_role_permission_exists(assignment.role_id, permission_id)
-
-                if not existing:
-                    role_permission_data = RolePermissionIn(
-                        role_id=assignment.role_id,
-                        permission_id=permission_id
-                    )
-                    role_permission = await self.create(role_permission_data)
-                    role_permissions.append(role_permission)
-                else:
-                    log.info(f"Role permission already exists: role={assignment.role_id}, permission={permission_id}")
-
+        """批量分配权限给角色（单条语句完成插入）"""
+        role_permissions = await self._insert_grants(assignment.role_id, assignment.permission_ids)
+        if not role_permissions:
+            return []
+
+        for role_permission in role_permissions:
+            self.projection.add_grant(assignment.role_id, role_permission.permission_id, role_permission.permission_code)
+        self._role_changed(assignment.role_id, role_permissions[0].role_code)
+        await publish_invalidation(
+            ROLE_PERMISSIONS_CHANGED, role_id=assignment.role_id,
+            granted={rp.permission_id: rp.permission_code for rp in role_permissions}
+        )
+        log.info(f"Assigned {len(role_permissions)} permissions to role: {assignment.role_id}")
         return role_permissions
 
     @measure("db_role_permission_revoke_permissions_seconds")
@@ -198,6 +251,9 @@ class RolePermissionRepo:
         params = [role_id] + permission_ids
         result = await self.dao.execute(query, *params)
 
+        self.projection.remove_grants(role_id, permission_ids)
+        self._role_changed(role_id)
+        await publish_invalidation(ROLE_PERMISSIONS_CHANGED, role_id=role_id, revoked=permission_ids)
         log.info(f"Revoked {result} permissions from role: {role_id}")
         return result
 
@@ -210,40 +266,20 @@ class RolePermissionRepo:
             await conn.execute(delete_query, role_id)
 
             # 添加新权限
-            role_permissions = []
-            for permission_id in permission_ids:
-                role_permission_data = RolePermissionIn(
-                    role_id=role_id,
-                    permission_id=permission_id
-                )
-                role_permission = await self.create(role_permission_data)
-                role_permissions.append(role_permission)
-
-            log.info(f"Replaced permissions for role {role_id}, new count: {len(permission_ids)}")
-            return role_permissions
-
-    @read_only_guard()
-    @measure("db_role_permission_check_exists_seconds")
-    async def _check_role_permission_exists(self, role_id: str, permission_id: str) -> bool:
-        """检查角色权限关系是否存在"""
-        query = f"""
-        SELECT 1 FROM {TABLE}
-        WHERE role_id = $1 AND permission_id = $2
-        """
-        row = await self.dao.fetch_one(query, role_id, permission_id)
-        return row is not None
+            role_permissions = await self._insert_grants(role_id, permission_ids)
+
+        # 事务提交后再整体替换投影中的权限集合
+        self.projection.clear_grants(role_id)
+        for role_permission in role_permissions:
+            self.projection.add_grant(role_id, role_permission.permission_id, role_permission.permission_code)
+        self._role_changed(role_id)
+        await publish_invalidation(
+            ROLE_PERMISSIONS_CHANGED, role_id=role_id, replace=True,
+            granted={rp.permission_id: rp.permission_code for rp in role_permissions}
+        )
 
-    @read_only_guard()
-    @measure("db_role_permission_get_details_seconds")
-    async def _get_role_permission_details(self, role_id: str, permission_id: str) -> Optional[dict]:
-        """获取角色权限详细信息"""
-        query = """
-        SELECT r.role_name, r.role_code, p.permission_name, p.permission_code
-        FROM mh_auth_roles r, mh_auth_permissions p
-        WHERE r.id = $1 AND p.id = $2
-        """
-        row = await self.dao.fetch_one(query, role_id, permission_id)
-        return dict(row) if row else None
+        log.info(f"Replaced permissions for role {role_id}, new count: {len(permission_ids)}")
+        return role_permissions
 
     @read_only_guard()
     @measure("db_role_permission_count_seconds")
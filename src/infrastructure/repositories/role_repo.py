@@ -8,6 +8,9 @@ from saturn_mousehunter_shared.foundation.ids import make_ulid
 from saturn_mousehunter_shared.aop.decorators import measure, read_only_guard
 from saturn_mousehunter_shared.log.logger import get_logger
 from infrastructure.db.base_dao import AsyncDAO
+from infrastructure.cache.role_permission_projection import RolePermissionProjection, get_role_permission_projection
+from infrastructure.cache.invalidation_bus import publish_invalidation
+from infrastructure.cache.rbac_invalidation import ROLE_CHANGED
 from domain.models.auth_role import RoleIn, RoleOut, RoleUpdate, RoleQuery, RoleWithPermissions
 
 log = get_logger(__name__)
@@ -18,8 +21,9 @@ TABLE = "mh_auth_roles"
 class RoleRepo:
     """角色Repository"""
 
-    def __init__(self, dao: AsyncDAO):
+    def __init__(self, dao: AsyncDAO, projection: Optional[RolePermissionProjection] = None):
         self.dao = dao
+        self.projection = projection if projection is not None else get_role_permission_projection()
 
     @measure("db_role_create_seconds")
     async def create(self, role_data: RoleIn) -> RoleOut:
@@ -30,9 +34,9 @@ class RoleRepo:
         query = f"""
         INSERT INTO {TABLE} (
             id, role_name, role_code, description, scope,
-            is_system_role, is_active, created_at, updated_at
+            is_system_role, is_active, parent_role_id, created_at, updated_at
         ) VALUES (
-            $1, $2, $3, $4, $5, $6, $7, $8, $9
+            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10
         ) RETURNING *
         """
 
@@ -45,10 +49,16 @@ class RoleRepo:
             role_data.scope.value,
             role_data.is_system_role,
             role_data.is_active,
+            role_data.parent_role_id,
             now,
             now
         )
 
+        self.projection.upsert_role(row['id'], row['role_code'], row['is_active'], row['parent_role_id'])
+        await publish_invalidation(
+            ROLE_CHANGED, role_id=row['id'], role_code=row['role_code'], is_active=row['is_active'],
+            parent_role_id=row['parent_role_id']
+        )
         log.info(f"Created role: {role_data.role_code}")
         return RoleOut.from_dict(dict(row))
 
@@ -113,10 +123,34 @@ class RoleRepo:
 
         row = await self.dao.fetch_one(query, *params)
         if row:
+            previous_code = self.projection.role_code(role_id)
+            self.projection.upsert_role(row['id'], row['role_code'], row['is_active'], row['parent_role_id'])
+            await publish_invalidation(
+                ROLE_CHANGED, role_id=row['id'], role_code=row['role_code'],
+                is_active=row['is_active'], parent_role_id=row['parent_role_id'], previous_code=previous_code
+            )
             log.info(f"Updated role: {role_id}")
             return RoleOut.from_dict(dict(row))
         return None
 
+    @read_only_guard()
+    @measure("db_role_is_ancestor_seconds")
+    async def is_ancestor_or_self(self, role_id: str, of_role_id: str) -> bool:
+        """role_id 是否为 of_role_id 本身或其祖先（用于设置父角色前检查环）"""
+        query = f"""
+        WITH RECURSIVE ancestors AS (
+            SELECT id, parent_role_id, ARRAY[id] AS path FROM {TABLE} WHERE id = $2
+            UNION ALL
+            SELECT r.id, r.parent_role_id, a.path || r.id
+            FROM {TABLE} r
+            JOIN ancestors a ON r.id = a.parent_role_id
+            WHERE r.id <> ALL(a.path)
+        )
+        SELECT 1 FROM ancestors WHERE id = $1 LIMIT 1
+        """
+        row = await self.dao.fetch_one(query, role_id, of_role_id)
+        return row is not None
+
     @measure("db_role_delete_seconds")
     async def delete(self, role_id: str) -> bool:
         """删除角色（软删除）"""
@@ -136,6 +170,11 @@ class RoleRepo:
         success = result > 0
 
         if success:
+            self.projection.set_role_active(role_id, False)
+            await publish_invalidation(
+                ROLE_CHANGED, role_id=role_id, role_code=role.role_code, is_active=False,
+                parent_role_id=role.parent_role_id
+            )
             log.info(f"Deleted role: {role_id}")
 
         return success
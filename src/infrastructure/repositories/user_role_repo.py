@@ -2,12 +2,16 @@
 认证服务 - 用户角色关系Repository
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from saturn_mousehunter_shared.foundation.ids import make_ulid
 from saturn_mousehunter_shared.aop.decorators import measure, read_only_guard
 from saturn_mousehunter_shared.log.logger import get_logger
 from infrastructure.db.base_dao import AsyncDAO
+from infrastructure.cache.permission_cache import PermissionCache, get_permission_cache
+from infrastructure.cache.role_permission_projection import RolePermissionProjection, get_role_permission_projection
+from infrastructure.cache.invalidation_bus import publish_invalidation
+from infrastructure.cache.rbac_invalidation import USER_ROLES_CHANGED
 from domain.models.auth_user_role import (
     UserRoleIn, UserRoleOut, UserRoleUpdate, UserRoleQuery,
     UserRoleAssignment, UserPermissions, UserType
@@ -18,11 +22,54 @@ log = get_logger(__name__)
 TABLE = "mh_auth_user_roles"
 
 
+def _effective_permissions_query(user_filter: str, group_by_user: bool = False) -> str:
+    """用户有效权限聚合查询：沿 parent_role_id 递归展开启用的角色（path 防止环）"""
+    user_columns = "er.user_id, er.user_type," if group_by_user else ""
+    group_by = "GROUP BY er.user_id, er.user_type" if group_by_user else ""
+    return f"""
+    WITH RECURSIVE effective_roles AS (
+        SELECT ur.user_id, ur.user_type, ur.expires_at,
+               r.id AS role_id, r.role_code, r.parent_role_id, ARRAY[r.id] AS path
+        FROM {TABLE} ur
+        JOIN mh_auth_roles r ON ur.role_id = r.id
+        WHERE {user_filter}
+          AND ur.is_active = true
+          AND r.is_active = true
+          AND (ur.expires_at IS NULL OR ur.expires_at > NOW())
+        UNION ALL
+        SELECT er.user_id, er.user_type, er.expires_at,
+               r.id, r.role_code, r.parent_role_id, er.path || r.id
+        FROM effective_roles er
+        JOIN mh_auth_roles r ON r.id = er.parent_role_id
+        WHERE r.is_active = true
+          AND r.id <> ALL(er.path)
+    )
+    SELECT
+        {user_columns}
+        array_remove(array_agg(DISTINCT p.permission_code ORDER BY p.permission_code), NULL) AS permissions,
+        array_agg(DISTINCT er.role_code ORDER BY er.role_code) AS roles,
+        MIN(er.expires_at) AS expires_at
+    FROM effective_roles er
+    LEFT JOIN mh_auth_role_permissions rp ON rp.role_id = er.role_id
+    LEFT JOIN mh_auth_permissions p ON rp.permission_id = p.id
+    {group_by}
+    """
+
+
 class UserRoleRepo:
     """用户角色关系Repository"""
 
-    def __init__(self, dao: AsyncDAO):
+    def __init__(self, dao: AsyncDAO,
+                 permission_cache: Optional[PermissionCache] = None,
+                 projection: Optional[RolePermissionProjection] = None):
         self.dao = dao
+        self.permission_cache = permission_cache if permission_cache is not None else get_permission_cache()
+        self.projection = projection if projection is not None else get_role_permission_projection()
+
+    async def _user_roles_changed(self, user_id: str, user_type: UserType) -> None:
+        """失效本进程缓存并通知其他 worker"""
+        self.permission_cache.invalidate_user(user_id, user_type)
+        await publish_invalidation(USER_ROLES_CHANGED, user_id=user_id, user_type=user_type.value)
 
     @measure("db_user_role_create_seconds")
     async def create(self, user_role_data: UserRoleIn) -> UserRoleOut:
@@ -30,13 +77,19 @@ class UserRoleRepo:
         user_role_id = make_ulid()
         now = datetime.now()
 
+        # 插入并在同一条语句中带回角色名称/编码
         query = f"""
-        INSERT INTO {TABLE} (
-            id, user_id, user_type, role_id, granted_by,
-            granted_at, expires_at, is_active
-        ) VALUES (
-            $1, $2, $3, $4, $5, $6, $7, $8
-        ) RETURNING *
+        WITH ins AS (
+            INSERT INTO {TABLE} (
+                id, user_id, user_type, role_id, granted_by,
+                granted_at, expires_at, is_active
+            ) VALUES (
+                $1, $2, $3, $4, $5, $6, $7, $8
+            ) RETURNING *
+        )
+        SELECT ins.*, r.role_name, r.role_code
+        FROM ins
+        LEFT JOIN mh_auth_roles r ON ins.role_id = r.id
         """
 
         row = await self.dao.fetch_one(
@@ -50,14 +103,9 @@ class UserRoleRepo:
             user_role_data.expires_at,
             user_role_data.is_active
         )
-
-        # 获取角色信息
         user_role = UserRoleOut.from_dict(dict(row))
-        role_info = await self._get_role_info(user_role_data.role_id)
-        if role_info:
-            user_role.role_name = role_info.get('role_name')
-            user_role.role_code = role_info.get('role_code')
 
+        await self._user_roles_changed(user_role_data.user_id, user_role_data.user_type)
         log.info(f"Created user role: user={user_role_data.user_id}, role={user_role_data.role_id}")
         return user_role
 
@@ -97,32 +145,34 @@ class UserRoleRepo:
         params.append(user_role_id)
 
         query = f"""
-        UPDATE {TABLE}
-        SET {', '.join(set_clauses)}
-        WHERE id = ${param_count}
-        RETURNING *
+        WITH upd AS (
+            UPDATE {TABLE}
+            SET {', '.join(set_clauses)}
+            WHERE id = ${param_count}
+            RETURNING *
+        )
+        SELECT upd.*, r.role_name, r.role_code
+        FROM upd
+        LEFT JOIN mh_auth_roles r ON upd.role_id = r.id
         """
 
         row = await self.dao.fetch_one(query, *params)
         if row:
             log.info(f"Updated user role: {user_role_id}")
             user_role = UserRoleOut.from_dict(dict(row))
-            # 获取角色信息
-            role_info = await self._get_role_info(user_role.role_id)
-            if role_info:
-                user_role.role_name = role_info.get('role_name')
-                user_role.role_code = role_info.get('role_code')
+            await self._user_roles_changed(user_role.user_id, user_role.user_type)
             return user_role
         return None
 
     @measure("db_user_role_delete_seconds")
     async def delete(self, user_role_id: str) -> bool:
         """删除用户角色关系"""
-        query = f"DELETE FROM {TABLE} WHERE id = $1"
-        result = await self.dao.execute(query, user_role_id)
-        success = result > 0
+        query = f"DELETE FROM {TABLE} WHERE id = $1 RETURNING user_id, user_type"
+        row = await self.dao.fetch_one(query, user_role_id)
+        success = row is not None
 
         if success:
+            await self._user_roles_changed(row['user_id'], UserType(row['user_type']))
             log.info(f"Deleted user role: {user_role_id}")
 
         return success
@@ -206,63 +256,161 @@ class UserRoleRepo:
     @read_only_guard()
     @measure("db_user_role_get_user_permissions_seconds")
     async def get_user_permissions(self, user_id: str, user_type: UserType) -> UserPermissions:
-        """获取用户的所有权限"""
-        query = f"""
-        SELECT DISTINCT p.permission_code, r.role_code
-        FROM {TABLE} ur
-        JOIN mh_auth_roles r ON ur.role_id = r.id
-        JOIN mh_auth_role_permissions rp ON r.id = rp.role_id
-        JOIN mh_auth_permissions p ON rp.permission_id = p.id
-        WHERE ur.user_id = $1
-          AND ur.user_type = $2
-          AND ur.is_active = true
-          AND r.is_active = true
-          AND (ur.expires_at IS NULL OR ur.expires_at > NOW())
-        ORDER BY p.permission_code, r.role_code
-        """
-
-        rows = await self.dao.fetch_all(query, user_id, user_type.value)
-
-        permissions = []
-        roles = []
-        for row in rows:
-            if row['permission_code'] not in permissions:
-                permissions.append(row['permission_code'])
-            if row['role_code'] not in roles:
-                roles.append(row['role_code'])
-
-        return UserPermissions(
+        """获取用户的所有权限（优先读取权限缓存）"""
+        cached = self.permission_cache.get(user_id, user_type)
+        if cached is not None:
+            return cached
+
+        # 读库前记录失效代数，读库期间发生撤销时不写回缓存
+        generation = self.permission_cache.generation
+        resolved = None
+        if self.projection.loaded:
+            # 只查询用户的角色ID，权限由角色权限投影合并
+            query = f"""
+            SELECT role_id, expires_at
+            FROM {TABLE}
+            WHERE user_id = $1
+              AND user_type = $2
+              AND is_active = true
+              AND (expires_at IS NULL OR expires_at > NOW())
+            """
+            rows = await self.dao.fetch_all(query, user_id, user_type.value)
+            resolved = self.projection.resolve(row['role_id'] for row in rows)
+            expiries = [row['expires_at'] for row in rows if row['expires_at']]
+            expires_at = min(expiries) if expiries else None
+
+        if resolved is not None:
+            permissions, roles = resolved
+        else:
+            # 递归展开继承的角色，去重和排序在数据库端聚合完成，只返回一行
+            query = _effective_permissions_query("ur.user_id = $1 AND ur.user_type = $2")
+            row = await self.dao.fetch_one(query, user_id, user_type.value)
+            permissions = list(row['permissions'] or [])
+            roles = list(row['roles'] or [])
+            expires_at = row['expires_at']
+
+        user_permissions = UserPermissions(
             user_id=user_id,
             user_type=user_type,
             permissions=permissions,
             roles=roles
         )
+        # 缓存不超过最早到期的角色分配
+        self.permission_cache.put(user_permissions, expires_at, generation)
+        return user_permissions
+
+    @read_only_guard()
+    @measure("db_user_role_get_users_permissions_seconds")
+    async def get_users_permissions(
+        self, users: Iterable[Tuple[str, UserType]]
+    ) -> Dict[Tuple[str, UserType], UserPermissions]:
+        """批量获取多个用户的权限，缓存未命中的用户合并为一次 ANY($1) 查询"""
+        result: Dict[Tuple[str, UserType], UserPermissions] = {}
+        missing: List[Tuple[str, UserType]] = []
+        for key in dict.fromkeys(users):
+            cached = self.permission_cache.get(*key)
+            if cached is not None:
+                result[key] = cached
+            else:
+                missing.append(key)
+
+        if not missing:
+            return result
+
+        generation = self.permission_cache.generation
+        user_ids = list({user_id for user_id, _ in missing})
+        resolved: Dict[Tuple[str, UserType], Tuple[List[str], List[str], Optional[datetime]]] = {}
+
+        if self.projection.loaded:
+            query = f"""
+            SELECT user_id, user_type, role_id, expires_at
+            FROM {TABLE}
+            WHERE user_id = ANY($1::varchar[])
+              AND is_active = true
+              AND (expires_at IS NULL OR expires_at > NOW())
+            """
+            rows = await self.dao.fetch_all(query, user_ids)
+            assignments: Dict[Tuple[str, str], list] = {}
+            for row in rows:
+                assignments.setdefault((row['user_id'], row['user_type']), []).append(row)
+
+            for key in missing:
+                user_rows = assignments.get((key[0], key[1].value), [])
+                projected = self.projection.resolve(row['role_id'] for row in user_rows)
+                if projected is not None:
+                    expiries = [row['expires_at'] for row in user_rows if row['expires_at']]
+                    resolved[key] = (*projected, min(expiries) if expiries else None)
+
+        unresolved = [key for key in missing if key not in resolved]
+        if unresolved:
+            query = _effective_permissions_query("ur.user_id = ANY($1::varchar[])", group_by_user=True)
+            rows = await self.dao.fetch_all(query, list({user_id for user_id, _ in unresolved}))
+            aggregated = {(row['user_id'], row['user_type']): row for row in rows}
+            for key in unresolved:
+                row = aggregated.get((key[0], key[1].value))
+                if row is None:
+                    # 没有任何有效角色分配
+                    resolved[key] = ([], [], None)
+                else:
+                    resolved[key] = (list(row['permissions'] or []), list(row['roles'] or []), row['expires_at'])
+
+        for key in missing:
+            permissions, roles, expires_at = resolved[key]
+            user_permissions = UserPermissions(
+                user_id=key[0],
+                user_type=key[1],
+                permissions=permissions,
+                roles=roles
+            )
+            self.permission_cache.put(user_permissions, expires_at, generation)
+            result[key] = user_permissions
+
+        return result
 
     @measure("db_user_role_assign_roles_seconds")
     async def assign_roles(self, assignment: UserRoleAssignment, granted_by: Optional[str] = None) -> List[UserRoleOut]:
-        """批量分配角色给用户"""
-        user_roles = []
-
-        async with self.dao.transaction():
-            for role_id in assignment.role_ids:
-                # 检查是否已存在
-                existing = await self._check_user_role_exists(
-                    assignment.user_id, assignment.user_type, role_id
-                )
-
-                if not existing:
-                    user_role_data = UserRoleIn(
-                        user_id=assignment.user_id,
-                        user_type=assignment.user_type,
-                        role_id=role_id,
-                        granted_by=granted_by,
-                        expires_at=assignment.expires_at
-                    )
-                    user_role = await self.create(user_role_data)
-                    user_roles.append(user_role)
-                else:
-                    log.info(f"User role already exists: user={assignment.user_id}, role={role_id}")
+        """批量分配角色给用户（单条语句完成插入，返回新分配的角色）"""
+        role_ids = list(dict.fromkeys(assignment.role_ids))
+        if not role_ids:
+            return []
 
+        # 已启用的分配保持不变，已撤销的分配重新启用；原子执行，只需一次往返
+        query = f"""
+        WITH assigned AS (
+            INSERT INTO {TABLE} AS ur (
+                id, user_id, user_type, role_id, granted_by,
+                granted_at, expires_at, is_active
+            )
+            SELECT t.id, $3::varchar, $4::varchar, t.role_id, $5::varchar, $6::timestamptz, $7::timestamptz, true
+            FROM unnest($1::varchar[], $2::varchar[]) AS t(id, role_id)
+            ON CONFLICT (user_id, user_type, role_id) DO UPDATE
+            SET is_active = true,
+                granted_by = EXCLUDED.granted_by,
+                granted_at = EXCLUDED.granted_at,
+                expires_at = EXCLUDED.expires_at
+            WHERE ur.is_active = false
+            RETURNING ur.*
+        )
+        SELECT a.*, r.role_name, r.role_code
+        FROM assigned a
+        LEFT JOIN mh_auth_roles r ON a.role_id = r.id
+        """
+
+        rows = await self.dao.fetch_all(
+            query,
+            [make_ulid() for _ in role_ids],
+            role_ids,
+            assignment.user_id,
+            assignment.user_type.value,
+            granted_by,
+            datetime.now(),
+            assignment.expires_at
+        )
+        user_roles = [UserRoleOut.from_dict(dict(row)) for row in rows]
+
+        if len(user_roles) < len(role_ids):
+            log.info(f"{len(role_ids) - len(user_roles)} roles already assigned to user: {assignment.user_id}")
+        await self._user_roles_changed(assignment.user_id, assignment.user_type)
         return user_roles
 
     @measure("db_user_role_revoke_roles_seconds")
@@ -281,28 +429,10 @@ class UserRoleRepo:
         params = [user_id, user_type.value] + role_ids
         result = await self.dao.execute(query, *params)
 
+        await self._user_roles_changed(user_id, user_type)
         log.info(f"Revoked {result} roles for user: {user_id}")
         return result
 
-    @read_only_guard()
-    @measure("db_user_role_check_exists_seconds")
-    async def _check_user_role_exists(self, user_id: str, user_type: UserType, role_id: str) -> bool:
-        """检查用户角色关系是否存在"""
-        query = f"""
-        SELECT 1 FROM {TABLE}
-        WHERE user_id = $1 AND user_type = $2 AND role_id = $3 AND is_active = true
-        """
-        row = await self.dao.fetch_one(query, user_id, user_type.value, role_id)
-        return row is not None
-
-    @read_only_guard()
-    @measure("db_user_role_get_role_info_seconds")
-    async def _get_role_info(self, role_id: str) -> Optional[dict]:
-        """获取角色信息"""
-        query = "SELECT role_name, role_code FROM mh_auth_roles WHERE id = $1"
-        row = await self.dao.fetch_one(query, role_id)
-        return dict(row) if row else None
-
     @read_only_guard()
     @measure("db_user_role_count_seconds")
     async def count(self, query_params: UserRoleQuery) -> int:
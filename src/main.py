@@ -4,8 +4,9 @@
 import os
 from pathlib import Path
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from saturn_mousehunter_shared.log.logger import get_logger
 
 # Load environment variables from .env file
@@ -24,8 +25,22 @@ except ImportError:
 from infrastructure.config import get_app_config
 from infrastructure.db import AsyncDAO
 from infrastructure.config import get_database_config
-from api.routes import admin_users, tenant_users, roles, permissions, auth, menus, menu_management
+from api.routes import admin_users, tenant_users, roles, permissions, auth, authz, menus, menu_management
 from api.dependencies.dao import set_dao
+from infrastructure.cache import (
+    PermissionCache, MenuTreeCache, RolePermissionProjection, InvalidationBus,
+    get_permission_cache, set_permission_cache, get_menu_tree_cache, set_menu_tree_cache,
+    get_role_permission_projection, set_role_permission_projection,
+    get_invalidation_bus, set_invalidation_bus, register_rbac_handlers, MENUS_CHANGED, RESYNC
+)
+from application.services.authz_service import get_policy_engine
+from application.services.menu_permission_service import MenuPermissionService, get_menu_engine, set_menu_engine
+from infrastructure.repositories import UserRoleRepo
+from infrastructure.repositories.menu_repo import MenuRepo
+from application.utils import (
+    JWTUtils, AsyncPasswordHasher, PasswordHasherBusyError,
+    get_jwt_verifier, set_jwt_verifier, set_password_hasher, shutdown_password_hasher
+)
 
 log = get_logger(__name__)
 
@@ -50,14 +65,61 @@ async def lifespan(app: FastAPI):
     # Set the DAO for dependency injection
     set_dao(dao)
 
+    # JWT校验器只在启动时构建一次，所有请求共享
+    set_jwt_verifier(JWTUtils(app_config.jwt))
+
+    # 密码哈希工作池，避免 bcrypt 阻塞事件循环
+    set_password_hasher(AsyncPasswordHasher(app_config.password_hashing))
+
+    # 用户有效权限缓存，角色/权限写操作精确失效
+    set_permission_cache(PermissionCache(app_config.permission_cache))
+
+    # 角色权限投影，加载完成前用户权限查询回退到连接查询
+    projection = RolePermissionProjection()
+    set_role_permission_projection(projection)
+
+    # 菜单权限服务只构建一次：建表/索引和菜单配置展开只在启动时执行，之后可通过 reload 重建
+    menu_engine = MenuPermissionService(user_role_repo=UserRoleRepo(dao), menu_repo=MenuRepo(dao))
+    try:
+        await menu_engine.initialize_menu_storage()
+    except Exception as e:
+        log.warning(f"菜单存储初始化失败，仅使用静态菜单配置: {e}")
+
+    # 跨 worker 缓存失效总线（LISTEN/NOTIFY），启动失败时仅影响多进程部署下的缓存一致性。
+    # 先开始监听再加载投影和菜单，加载期间其他 worker 的变更不会丢失
+    if app_config.invalidation_bus_enabled:
+        bus = InvalidationBus(dao)
+        register_rbac_handlers(bus, dao)
+        bus.subscribe(MENUS_CHANGED, menu_engine.handle_menus_changed)
+        bus.subscribe(RESYNC, lambda event: menu_engine.reload())
+        try:
+            await bus.start()
+            set_invalidation_bus(bus)
+        except Exception as e:
+            log.warning(f"缓存失效总线启动失败: {e}")
+
+    try:
+        await projection.load(dao)
+    except Exception as e:
+        log.warning(f"角色权限投影加载失败，使用数据库连接查询: {e}")
+
+    await menu_engine.reload()
+    set_menu_engine(menu_engine)
+
     log.info(f"认证服务已启动 - {app_config.app_name} v{app_config.version}")
 
     yield
 
     # 关闭阶段
     log.info("正在关闭认证服务...")
+    bus = get_invalidation_bus()
+    if bus:
+        await bus.stop()
+        set_invalidation_bus(None)
+    set_menu_engine(None)
     if dao:
         await dao.close_pool()
+    shutdown_password_hasher()
     log.info("认证服务已关闭")
 
 
@@ -79,6 +141,16 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    """密码哈希队列已满时返回503，由客户端稍后重试"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_seconds)}
+    )
+
+
 @app.get("/health")
 async def health_check():
     """健康检查"""
@@ -89,16 +161,26 @@ async def health_check():
         "service": app_config.app_name,
         "version": app_config.version,
         "database": "connected" if db_healthy else "disconnected",
+        "token_cache": get_jwt_verifier().get_cache_stats(),
+        "permission_cache": get_permission_cache().get_stats(),
+        "menu_cache": get_menu_tree_cache().get_stats(),
+        "role_permission_projection": get_role_permission_projection().get_stats(),
+        "invalidation_bus": get_invalidation_bus().get_stats() if get_invalidation_bus() else None,
+        "policy_engine": get_policy_engine().get_stats(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
+# 标准JWKS发现地址，与 /api/v1/auth/jwks 返回相同内容
+app.add_api_route("/.well-known/jwks.json", auth.get_jwks, methods=["GET"], include_in_schema=False)
+
 # 注册路由
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(admin_users.router, prefix="/api/v1")
 app.include_router(tenant_users.router, prefix="/api/v1")
 app.include_router(roles.router, prefix="/api/v1")
 app.include_router(permissions.router, prefix="/api/v1")
+app.include_router(authz.router, prefix="/api/v1")
 app.include_router(menus.router)  # 菜单权限路由已包含prefix
 app.include_router(menu_management.router)  # 菜单管理路由已包含prefix
 
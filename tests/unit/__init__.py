@@ -0,0 +1,9 @@
+"""
+单元测试：被测模块位于 src/ 下
+"""
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,207 @@
+"""
+菜单索引与 ETag 测试
+"""
+import json
+import random
+import unittest
+
+from application.services.menu_permission_service import (
+    MenuIndex, MenuPermissionService, etag_matches
+)
+from application.utils.permission_registry import PermissionRegistry, PermissionSet
+from domain.models.auth_menu import (
+    DEFAULT_MENU_CONFIG, SATURN_MHC_MENU_CONFIG, MenuConfig, MenuTree
+)
+from domain.models.auth_user_role import UserPermissions, UserType
+from infrastructure.cache.menu_tree_cache import MenuTreeCache
+from infrastructure.config.app_config import MenuCacheConfig
+
+
+def recursive_filter(menus, user_permissions):
+    """编译索引之前的递归过滤实现，作为参照"""
+    filtered = []
+    for menu in menus:
+        node = MenuTree(
+            id=menu.id, name=menu.name, title=menu.title, title_en=menu.title_en,
+            path=menu.path, icon=menu.icon, emoji=menu.emoji, permission=menu.permission,
+            menu_type=menu.menu_type, sort_order=menu.sort_order, is_hidden=menu.is_hidden,
+            status=menu.status, meta=menu.meta, children=[]
+        )
+        if menu.children:
+            node.children = recursive_filter(menu.children, user_permissions)
+            if node.children or not menu.permission or menu.permission in user_permissions:
+                filtered.append(node)
+        elif not menu.permission or menu.permission in user_permissions:
+            filtered.append(node)
+    filtered.sort(key=lambda x: x.sort_order)
+    return filtered
+
+
+def dump(menus):
+    return json.dumps([menu.model_dump(mode="json") for menu in menus])
+
+
+def all_permissions(menus):
+    codes = set()
+    for menu in menus:
+        if menu.permission:
+            codes.add(menu.permission)
+        codes |= all_permissions(menu.children or [])
+    return codes
+
+
+class TestMenuIndex(unittest.TestCase):
+
+    def test_matches_recursive_filter(self):
+        rng = random.Random(20240501)
+        for config in (SATURN_MHC_MENU_CONFIG, DEFAULT_MENU_CONFIG):
+            registry = PermissionRegistry()
+            index = MenuIndex(config, registry)
+            codes = sorted(all_permissions(config))
+            for _ in range(100):
+                held = rng.sample(codes, rng.randint(0, len(codes)))
+                self.assertEqual(
+                    dump(index.filter(PermissionSet(held, registry))),
+                    dump(recursive_filter(config, set(held)))
+                )
+            self.assertEqual(dump(index.tree()), dump(recursive_filter(config, set(codes))))
+
+    def test_wildcard_grant(self):
+        registry = PermissionRegistry()
+        index = MenuIndex(SATURN_MHC_MENU_CONFIG, registry)
+        menu_codes = {code for code in all_permissions(SATURN_MHC_MENU_CONFIG) if code.startswith("menu:")}
+        self.assertEqual(
+            dump(index.filter(PermissionSet(["menu:*"], registry))),
+            dump(recursive_filter(SATURN_MHC_MENU_CONFIG, menu_codes))
+        )
+
+
+class FakeUserRoleRepo:
+
+    def __init__(self, permissions):
+        self.permissions = permissions
+        self.calls = 0
+
+    async def get_user_permissions(self, user_id, user_type):
+        self.calls += 1
+        return UserPermissions(user_id=user_id, user_type=user_type, permissions=self.permissions, roles=[])
+
+
+class FakeMenuRepo:
+
+    def __init__(self, menus):
+        self.menus = menus
+
+    async def get_all_menus(self, status=None):
+        return self.menus
+
+    async def get_menu_by_id(self, menu_id):
+        return next((menu for menu in self.menus if menu.id == menu_id), None)
+
+
+def make_service(permissions=(), menus=None):
+    return MenuPermissionService(
+        FakeUserRoleRepo(list(permissions)),
+        FakeMenuRepo(menus) if menus is not None else None,
+        use_saturn_mhc_menus=False,
+        menu_cache=MenuTreeCache(MenuCacheConfig()),
+    )
+
+
+class TestMenuReload(unittest.IsolatedAsyncioTestCase):
+
+    async def test_database_menus_served_after_reload(self):
+        parent = next(menu for menu in DEFAULT_MENU_CONFIG if menu.children)
+        menus = [
+            MenuConfig(id="db_child", name="db_child", title="DB Child", parent_id=parent.id, sort_order=999),
+            MenuConfig(id="db_root", name="db_root", title="DB Root", sort_order=999),
+        ]
+        service = make_service(menus=menus)
+        await service.reload()
+
+        tree = service.get_menu_tree()
+        self.assertIn("db_root", [menu.id for menu in tree])
+        children = next(menu for menu in tree if menu.id == parent.id).children
+        self.assertEqual(children[-1].id, "db_child")
+
+    async def test_parent_cycle_dropped(self):
+        menus = [
+            MenuConfig(id="a", name="a", title="A", parent_id="b"),
+            MenuConfig(id="b", name="b", title="B", parent_id="a"),
+        ]
+        service = make_service(menus=menus)
+        await service.reload()
+        self.assertEqual(dump(service.get_menu_tree()), dump(MenuIndex(DEFAULT_MENU_CONFIG).tree()))
+
+
+class TestEtagMatches(unittest.TestCase):
+
+    def test_weak_comparison(self):
+        self.assertTrue(etag_matches('W/"abc"', 'W/"abc"'))
+        self.assertTrue(etag_matches('"abc"', 'W/"abc"'))
+        self.assertTrue(etag_matches('W/"abc"', '"abc"'))
+        self.assertFalse(etag_matches('"abd"', '"abc"'))
+
+    def test_lists_and_wildcard(self):
+        self.assertTrue(etag_matches('"x", W/"abc" ,"y"', 'W/"abc"'))
+        self.assertTrue(etag_matches('*', '"abc"'))
+        self.assertFalse(etag_matches('"x", "y"', '"abc"'))
+
+    def test_missing_header(self):
+        self.assertFalse(etag_matches(None, '"abc"'))
+        self.assertFalse(etag_matches("", '"abc"'))
+
+
+class TestUserMenusEtag(unittest.IsolatedAsyncioTestCase):
+
+    async def test_not_modified(self):
+        service = make_service(["user:read"])
+        body, etag = await service.render_user_menus_response("u1", UserType.ADMIN)
+        self.assertIsNotNone(body)
+        self.assertEqual(json.loads(body)["user_id"], "u1")
+
+        body, same = await service.render_user_menus_response("u1", UserType.ADMIN, etag)
+        self.assertIsNone(body)
+        self.assertEqual(same, etag)
+
+    async def test_etag_shared_across_workers(self):
+        first, second = make_service(["user:read"]), make_service(["user:read"])
+        _, etag = await first.render_user_menus_response("u1", UserType.ADMIN)
+        body, _ = await second.render_user_menus_response("u1", UserType.ADMIN, etag)
+        self.assertIsNone(body)
+
+    async def test_etag_changes_with_permissions_and_user(self):
+        service = make_service(["user:read"])
+        _, etag = await service.render_user_menus_response("u1", UserType.ADMIN)
+        body, _ = await service.render_user_menus_response("u2", UserType.ADMIN, etag)
+        self.assertIsNotNone(body)
+
+        service.user_role_repo.permissions = ["user:read", "role:read"]
+        body, changed = await service.render_user_menus_response("u1", UserType.ADMIN, etag)
+        self.assertIsNotNone(body)
+        self.assertNotEqual(changed, etag)
+
+    async def test_etag_changes_with_menu_config(self):
+        service = make_service(["user:read"], menus=[])
+        _, etag = await service.render_user_menus_response("u1", UserType.ADMIN)
+        service.menu_repo.menus = [MenuConfig(id="db_root", name="db_root", title="DB Root")]
+        await service.reload()
+        body, changed = await service.render_user_menus_response("u1", UserType.ADMIN, etag)
+        self.assertIsNotNone(body)
+        self.assertNotEqual(changed, etag)
+        self.assertIn("db_root", [menu["id"] for menu in json.loads(body)["menus"]])
+
+    async def test_error_returns_empty_menus_without_etag(self):
+        service = make_service()
+
+        async def fail(user_id, user_type):
+            raise RuntimeError("database unavailable")
+
+        service.user_role_repo.get_user_permissions = fail
+        body, etag = await service.render_user_menus_response("u1", UserType.ADMIN)
+        self.assertIsNone(etag)
+        self.assertEqual(json.loads(body)["menus"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
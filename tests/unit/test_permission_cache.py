@@ -0,0 +1,145 @@
+"""
+用户有效权限缓存测试
+"""
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from infrastructure.cache import permission_cache as permission_cache_module
+from infrastructure.cache.permission_cache import PermissionCache
+from infrastructure.cache.role_permission_projection import RolePermissionProjection
+from infrastructure.config.app_config import PermissionCacheConfig
+from infrastructure.repositories.user_role_repo import UserRoleRepo
+from domain.models.auth_user_role import UserPermissions, UserType
+
+
+def make_permissions(user_id, permissions=("user:read",), roles=("viewer",), user_type=UserType.ADMIN):
+    return UserPermissions(user_id=user_id, user_type=user_type, permissions=list(permissions), roles=list(roles))
+
+
+class TestPermissionCache(unittest.TestCase):
+    """TTL、LRU 与反向索引失效"""
+
+    def setUp(self):
+        self.cache = PermissionCache(PermissionCacheConfig(max_size=3, ttl_seconds=60))
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get("u1", UserType.ADMIN))
+        self.cache.put(make_permissions("u1"))
+        self.assertEqual(self.cache.get("u1", UserType.ADMIN).permissions, ["user:read"])
+        self.assertIsNone(self.cache.get("u1", UserType.TENANT))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_ttl_expiry(self):
+        with patch.object(permission_cache_module.time, "monotonic", return_value=1000.0):
+            self.cache.put(make_permissions("u1"))
+        with patch.object(permission_cache_module.time, "monotonic", return_value=1059.0):
+            self.assertIsNotNone(self.cache.get("u1", UserType.ADMIN))
+        with patch.object(permission_cache_module.time, "monotonic", return_value=1060.0):
+            self.assertIsNone(self.cache.get("u1", UserType.ADMIN))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_ttl_capped_by_role_expiry(self):
+        now = datetime.now(timezone.utc)
+        self.cache.put(make_permissions("u1"), now - timedelta(seconds=1))
+        self.assertIsNone(self.cache.get("u1", UserType.ADMIN))
+
+        with patch.object(permission_cache_module.time, "monotonic", return_value=1000.0):
+            self.cache.put(make_permissions("u2"), now + timedelta(seconds=10))
+        with patch.object(permission_cache_module.time, "monotonic", return_value=1011.0):
+            self.assertIsNone(self.cache.get("u2", UserType.ADMIN))
+
+    def test_lru_eviction(self):
+        for user_id in ("u1", "u2", "u3"):
+            self.cache.put(make_permissions(user_id))
+        self.cache.get("u1", UserType.ADMIN)  # u1 变为最近使用
+        self.cache.put(make_permissions("u4"))
+
+        self.assertIsNone(self.cache.get("u2", UserType.ADMIN))
+        for user_id in ("u1", "u3", "u4"):
+            self.assertIsNotNone(self.cache.get(user_id, UserType.ADMIN))
+
+    def test_invalidate_by_role_and_permission(self):
+        self.cache.put(make_permissions("u1", ("user:read",), ("viewer",)))
+        self.cache.put(make_permissions("u2", ("user:write",), ("editor",)))
+        self.cache.put(make_permissions("u3", ("user:read", "user:write"), ("viewer", "editor")))
+
+        self.assertEqual(self.cache.invalidate_roles(["editor"]), 2)
+        self.assertIsNotNone(self.cache.get("u1", UserType.ADMIN))
+        self.assertIsNone(self.cache.get("u2", UserType.ADMIN))
+        self.assertIsNone(self.cache.get("u3", UserType.ADMIN))
+
+        self.assertEqual(self.cache.invalidate_permissions(["user:read"]), 1)
+        self.assertEqual(len(self.cache), 0)
+        # 反向索引随条目一起清理
+        self.assertEqual(self.cache._by_role, {})
+        self.assertEqual(self.cache._by_permission, {})
+
+    def test_invalidate_user_all_types(self):
+        self.cache.put(make_permissions("u1", user_type=UserType.ADMIN))
+        self.cache.put(make_permissions("u1", user_type=UserType.TENANT))
+        self.assertEqual(self.cache.invalidate_user("u1"), 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_put_dropped_after_invalidation(self):
+        generation = self.cache.generation
+        # 失效时该用户尚未缓存，也必须使进行中的填充作废
+        self.assertEqual(self.cache.invalidate_user("u1", UserType.ADMIN), 0)
+        self.cache.put(make_permissions("u1"), generation=generation)
+        self.assertIsNone(self.cache.get("u1", UserType.ADMIN))
+        self.assertEqual(self.cache.get_stats()["stale_puts"], 1)
+
+        self.cache.put(make_permissions("u1"), generation=self.cache.generation)
+        self.assertIsNotNone(self.cache.get("u1", UserType.ADMIN))
+
+    def test_disabled(self):
+        cache = PermissionCache(PermissionCacheConfig(max_size=0))
+        cache.put(make_permissions("u1"))
+        self.assertIsNone(cache.get("u1", UserType.ADMIN))
+
+
+class SlowPermissionDAO:
+    """读取在 gate 放行前挂起，模拟慢查询"""
+
+    def __init__(self):
+        self.permissions = ["user:write"]
+        self.gate = None
+
+    async def fetch_one(self, query, *args):
+        snapshot = list(self.permissions)
+        if self.gate is not None:
+            await self.gate.wait()
+        return {"permissions": snapshot, "roles": ["editor"], "expires_at": None}
+
+    async def execute(self, query, *args):
+        self.permissions = []
+        return 1
+
+    def in_transaction(self):
+        return False
+
+
+class TestPermissionCacheFillRace(unittest.IsolatedAsyncioTestCase):
+    """撤销与慢查询并发时不把撤销前的权限写回缓存"""
+
+    async def test_revoke_during_fill(self):
+        dao = SlowPermissionDAO()
+        cache = PermissionCache(PermissionCacheConfig())
+        repo = UserRoleRepo(dao, cache, RolePermissionProjection())
+
+        dao.gate = asyncio.Event()
+        pending = asyncio.create_task(repo.get_user_permissions("u1", UserType.ADMIN))
+        await asyncio.sleep(0)
+        await repo.revoke_roles("u1", UserType.ADMIN, ["r1"])
+        dao.gate.set()
+
+        # 进行中的调用返回的是它读到的快照，但不能进入缓存
+        self.assertEqual((await pending).permissions, ["user:write"])
+        dao.gate = None
+        self.assertEqual((await repo.get_user_permissions("u1", UserType.ADMIN)).permissions, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+权限紧凑编码测试
+"""
+import unittest
+
+import jwt
+
+from application.utils.jwt_utils import JWTUtils
+from application.utils.permission_codec import PERMISSION_DICTIONARY, PermissionCodec
+from infrastructure.config.app_config import JWTConfig
+
+
+class TestPermissionCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = PermissionCodec()
+
+    def test_round_trip(self):
+        permissions = ["user:read", "strategy:write", "custom:thing", PERMISSION_DICTIONARY[0]]
+        encoded, overflow = self.codec.encode(permissions)
+        self.assertEqual(overflow, ["custom:thing"])
+        expanded = self.codec.expand(self.codec.decode_bits(encoded))
+        self.assertEqual(sorted(expanded + overflow), sorted(permissions))
+
+    def test_empty(self):
+        encoded, overflow = self.codec.encode([])
+        self.assertEqual((encoded, overflow), ("", []))
+        self.assertEqual(self.codec.decode_bits(encoded), 0)
+
+    def test_compile_matches_encode(self):
+        bits, overflow = self.codec.compile(["user:read", "custom:thing"])
+        encoded, _ = self.codec.encode(["user:read", "custom:thing"])
+        self.assertEqual(self.codec.decode_bits(encoded), bits)
+        self.assertEqual(overflow, frozenset({"custom:thing"}))
+
+
+class TestCompactPermissionTokens(unittest.TestCase):
+
+    def setUp(self):
+        self.config = JWTConfig(secret_key="unit-test-secret-key-0123456789abcdef", compact_permissions=True, verify_cache_size=0)
+        self.jwt_utils = JWTUtils(self.config)
+
+    def test_token_round_trip(self):
+        token = self.jwt_utils.create_access_token(
+            subject="alice", user_type="ADMIN", user_id="u1",
+            permissions=["user:read", "custom:thing"], roles=["viewer"]
+        )
+        payload = jwt.decode(token, options={"verify_signature": False})
+        self.assertIn("pb", payload)
+        self.assertEqual(payload["permissions"], ["custom:thing"])
+
+        user_info = self.jwt_utils.extract_user_info(token)
+        self.assertEqual(sorted(user_info["permissions"]), ["custom:thing", "user:read"])
+        self.assertEqual(user_info["permission_overflow"], frozenset({"custom:thing"}))
+
+    def test_version_mismatch_rejected(self):
+        token = self.jwt_utils.create_access_token(
+            subject="alice", user_type="ADMIN", user_id="u1",
+            permissions=["user:read"], additional_claims={"pv": self.jwt_utils._permission_codec.version + 1}
+        )
+        self.assertIsNone(self.jwt_utils.extract_user_info(token))
+
+
+if __name__ == '__main__':
+    unittest.main()
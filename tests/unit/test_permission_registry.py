@@ -0,0 +1,78 @@
+"""
+权限位注册表与通配符语义测试
+"""
+import unittest
+
+from application.utils.permission_registry import PermissionRegistry, PermissionSet
+from application.utils.principal import Principal
+
+
+class TestPermissionRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = PermissionRegistry(["strategy:read", "strategy:write", "user:read", "menu:admin.users"])
+
+    def test_intern_is_stable(self):
+        position = self.registry.intern("risk:read")
+        self.assertEqual(self.registry.intern("risk:read"), position)
+        self.assertEqual(self.registry.position("risk:read"), position)
+        self.assertIsNone(self.registry.position("risk:write"))
+
+    def test_wildcard_grant_expands(self):
+        held = self.registry.lookup_mask(["strategy:*"])
+        self.assertEqual(held, self.registry.mask(["strategy:read", "strategy:write"]))
+        # 之后登记的编码也会被已持有的通配符覆盖
+        self.registry.intern("strategy:delete")
+        self.assertTrue(PermissionSet(["strategy:*"], self.registry).mask & self.registry.mask(["strategy:delete"]))
+
+    def test_wildcard_requirement_is_literal(self):
+        required = self.registry.mask(["strategy:*"])
+        self.assertNotEqual(required, 0)
+        plain = self.registry.lookup_mask(["strategy:read", "strategy:write"])
+        self.assertNotEqual(plain & required, required)
+        self.assertEqual(self.registry.lookup_mask(["strategy:*"]) & required, required)
+
+    def test_shorter_wildcard_covers_longer_requirement(self):
+        required = self.registry.mask(["menu:admin.*"])
+        self.assertEqual(self.registry.lookup_mask(["menu:*"]) & required, required)
+        self.assertNotEqual(self.registry.lookup_mask(["menu:admin.users"]) & required, required)
+
+    def test_requirement_without_registered_codes(self):
+        # 前缀下没有任何已登记编码时，要求也不能退化为空掩码
+        required = self.registry.mask(["zz:*"])
+        self.assertNotEqual(required, 0)
+        self.assertEqual(self.registry.lookup_mask(["user:read"]) & required, 0)
+
+    def test_grant_mask_interns_concrete_codes(self):
+        mask = self.registry.grant_mask(["risk:write", "strategy:*"])
+        self.assertIsNotNone(self.registry.position("risk:write"))
+        self.assertEqual(mask, self.registry.lookup_mask(["risk:write", "strategy:*"]))
+
+
+class TestPermissionSet(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = PermissionRegistry(["strategy:read", "user:read"])
+
+    def test_contains(self):
+        permissions = PermissionSet(["strategy:*", "user:read"], self.registry)
+        self.assertIn("strategy:read", permissions)
+        self.assertIn("strategy:unregistered", permissions)
+        self.assertIn("user:read", permissions)
+        self.assertNotIn("user:write", permissions)
+
+    def test_without_wildcards(self):
+        permissions = PermissionSet(["user:read"], self.registry)
+        self.assertNotIn("strategy:read", permissions)
+        self.assertEqual(len(permissions), 1)
+
+
+class TestPrincipalMasks(unittest.TestCase):
+
+    def test_empty_requirement_denied(self):
+        principal = Principal({"user_id": "u1", "user_type": "ADMIN", "permissions": ["user:read"], "roles": []})
+        self.assertFalse(principal.has_all_permissions(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+角色权限投影测试（继承闭包）
+"""
+import unittest
+
+from infrastructure.cache.role_permission_projection import RolePermissionProjection
+
+
+class FakeDAO:
+    """按查询的表名返回预置行"""
+
+    def __init__(self, roles, permissions, grants):
+        self.rows = {
+            "mh_auth_roles": roles,
+            "mh_auth_permissions": permissions,
+            "mh_auth_role_permissions": grants,
+        }
+
+    async def fetch_all(self, query, *args):
+        table = query.rsplit("FROM", 1)[1].split()[0]
+        return self.rows[table]
+
+
+def role(role_id, parent_id=None, is_active=True):
+    return {"id": role_id, "role_code": role_id, "is_active": is_active, "parent_role_id": parent_id}
+
+
+class TestRolePermissionProjection(unittest.IsolatedAsyncioTestCase):
+
+    async def load(self, roles, grants):
+        permissions = [{"id": f"p-{code}", "permission_code": code} for code in sorted({code for _, code in grants})]
+        grant_rows = [{"role_id": role_id, "permission_id": f"p-{code}"} for role_id, code in grants]
+        projection = RolePermissionProjection()
+        await projection.load(FakeDAO(roles, permissions, grant_rows))
+        return projection
+
+    async def test_unloaded_returns_none(self):
+        self.assertIsNone(RolePermissionProjection().resolve(["r1"]))
+
+    async def test_inherits_ancestor_permissions(self):
+        projection = await self.load(
+            [role("root"), role("mid", "root"), role("leaf", "mid")],
+            [("root", "user:read"), ("mid", "role:read"), ("leaf", "user:write")],
+        )
+        permissions, roles = projection.resolve(["leaf"])
+        self.assertEqual(permissions, ["role:read", "user:read", "user:write"])
+        self.assertEqual(roles, ["leaf", "mid", "root"])
+        self.assertEqual(projection.resolve(["root"]), (["user:read"], ["root"]))
+
+    async def test_inactive_ancestor_stops_inheritance(self):
+        projection = await self.load(
+            [role("root"), role("mid", "root", is_active=False), role("leaf", "mid")],
+            [("root", "user:read"), ("mid", "role:read"), ("leaf", "user:write")],
+        )
+        self.assertEqual(projection.resolve(["leaf"]), (["user:write"], ["leaf"]))
+        # 停用的角色本身也不授予权限
+        self.assertEqual(projection.resolve(["mid"]), ([], []))
+
+    async def test_cycle_guard(self):
+        projection = await self.load(
+            [role("a", "b"), role("b", "a")],
+            [("a", "user:read"), ("b", "user:write")],
+        )
+        self.assertEqual(projection.resolve(["a"]), (["user:read", "user:write"], ["a", "b"]))
+
+    async def test_unknown_role_falls_back(self):
+        projection = await self.load([role("a")], [])
+        self.assertIsNone(projection.resolve(["a", "missing"]))
+
+    async def test_closure_rebuilt_after_change(self):
+        projection = await self.load(
+            [role("root"), role("leaf")],
+            [("root", "user:read")],
+        )
+        self.assertEqual(projection.resolve(["leaf"]), ([], ["leaf"]))
+        projection.upsert_role("leaf", "leaf", True, parent_id="root")
+        self.assertEqual(projection.resolve(["leaf"]), (["user:read"], ["leaf", "root"]))
+        projection.set_role_active("root", False)
+        self.assertEqual(projection.resolve(["leaf"]), ([], ["leaf"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+已验证令牌缓存测试
+"""
+import unittest
+from unittest.mock import patch
+
+from application.utils import token_cache as token_cache_module
+from application.utils.token_cache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TokenCache(max_size=2)
+
+    def test_expired_token_not_cached(self):
+        with patch.object(token_cache_module.time, "time", return_value=1000.0):
+            self.cache.put("token", {"user_id": "u1"}, 1000.0)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_entry_expires_with_token(self):
+        with patch.object(token_cache_module.time, "time", return_value=1000.0):
+            self.cache.put("token", {"user_id": "u1"}, 1030.0)
+            self.assertEqual(self.cache.get("token"), {"user_id": "u1"})
+        with patch.object(token_cache_module.time, "time", return_value=1029.9):
+            self.assertIsNotNone(self.cache.get("token"))
+        with patch.object(token_cache_module.time, "time", return_value=1030.0):
+            self.assertIsNone(self.cache.get("token"))
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        with patch.object(token_cache_module.time, "time", return_value=1000.0):
+            self.cache.put("a", {"user_id": "a"}, 2000.0)
+            self.cache.put("b", {"user_id": "b"}, 2000.0)
+            self.cache.get("a")
+            self.cache.put("c", {"user_id": "c"}, 2000.0)
+            self.assertIsNone(self.cache.get("b"))
+            self.assertIsNotNone(self.cache.get("a"))
+            self.assertIsNotNone(self.cache.get("c"))
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_keyed_by_digest(self):
+        with patch.object(token_cache_module.time, "time", return_value=1000.0):
+            self.cache.put("secret-token", {"user_id": "u1"}, 2000.0)
+        self.assertNotIn("secret-token", self.cache._entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
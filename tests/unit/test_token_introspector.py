@@ -0,0 +1,70 @@
+"""
+令牌自省测试
+"""
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from application.utils.jwt_utils import JWTUtils
+from application.utils.token_introspector import TokenIntrospector
+from infrastructure.config.app_config import JWTConfig
+
+
+class TestTokenIntrospector(unittest.TestCase):
+
+    def setUp(self):
+        self.jwt_utils = JWTUtils(JWTConfig(secret_key="unit-test-secret-key-0123456789abcdef", verify_cache_size=0))
+        self.introspector = TokenIntrospector(self.jwt_utils)
+
+    def access_token(self, expires_delta=timedelta(minutes=5)):
+        return self.jwt_utils.create_access_token(
+            subject="alice", user_type="ADMIN", user_id="u1", expires_delta=expires_delta
+        )
+
+    def test_valid(self):
+        status = self.introspector.introspect(self.access_token())
+        self.assertTrue(status.valid)
+        self.assertFalse(status.expired)
+        self.assertEqual((status.user_id, status.user_type), ("u1", "ADMIN"))
+        self.assertIsNotNone(status.issued_at)
+        self.assertTrue(0 < status.time_until_expiry <= 300)
+
+    def test_expired(self):
+        status = self.introspector.introspect(self.access_token(timedelta(seconds=-10)))
+        self.assertFalse(status.valid)
+        self.assertTrue(status.expired)
+        self.assertIsNotNone(status.expires_at)
+
+    def test_expiry_uses_supplied_clock(self):
+        token = self.access_token()
+        later = datetime.now(timezone.utc) + timedelta(minutes=10)
+        self.assertTrue(self.introspector.introspect(token, later).expired)
+
+    def test_bad_signature(self):
+        other = JWTUtils(JWTConfig(secret_key="another-secret-key-0123456789abcdef", verify_cache_size=0))
+        token = other.create_access_token(subject="alice", user_type="ADMIN", user_id="u1")
+        status = self.introspector.introspect(token)
+        self.assertFalse(status.valid)
+        self.assertTrue(status.expired)
+        self.assertIsNone(status.expires_at)
+
+    def test_garbage(self):
+        status = self.introspector.introspect("not-a-token")
+        self.assertEqual((status.valid, status.expired), (False, True))
+
+    def test_wrong_token_type(self):
+        token = self.jwt_utils.create_refresh_token(subject="alice", user_type="ADMIN", user_id="u1")
+        status = self.introspector.introspect(token)
+        self.assertFalse(status.valid)
+        self.assertFalse(status.expired)
+        self.assertIsNotNone(status.time_until_expiry)
+
+    def test_introspect_many_preserves_order(self):
+        valid = self.access_token()
+        expired = self.access_token(timedelta(seconds=-10))
+        statuses = self.introspector.introspect_many([valid, expired, valid])
+        self.assertEqual([status.valid for status in statuses], [True, False, True])
+        self.assertIs(statuses[0], statuses[2])
+
+
+if __name__ == '__main__':
+    unittest.main()